@@ -28,6 +28,7 @@ from .models import (
     AccomplishmentShare,
     UserJob,
     Conversation,
+    ConversationReadState,
     Message
 )
 
@@ -221,10 +222,11 @@ class ProfessionalInformationAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.prefetch_related('work_experiences', 'educations', 'language_skills', 'certificates', )
+        return queryset.prefetch_related('work_experiences_set')
 
     def get_work_experiences(self, obj):
-        return ', '.join(experience.organization_name for experience in obj.work_experiences.all()) if obj.work_experiences.exists() else 'No experience'
+        experiences = obj.work_experiences_set.all()
+        return ', '.join(experience.organization_name or '' for experience in experiences) if experiences else 'No experience'
     get_work_experiences.short_description = 'Work Experiences'
 
 
@@ -278,7 +280,9 @@ class SubGoalInline(admin.TabularInline):
 
 # MainGoal Admin
 class MainGoalAdmin(admin.ModelAdmin):
-    list_display = ('name', 'category', 'start_date', 'end_date', 'status')
+    list_display = ('name', 'user', 'category', 'start_date', 'end_date', 'status', 'progress')
+    # "Empty" finds goals from before they were owned, which the API doesn't list
+    list_filter = (('user', admin.EmptyFieldListFilter),)
     inlines = [SubGoalInline]
     search_fields = ('name',)
     ordering = ('start_date',)
@@ -536,3 +540,4 @@ class AccomplishmentShareAdmin(admin.ModelAdmin):
 admin.site.register(UserJob)
 admin.site.register(Conversation)
 admin.site.register(Message)
+admin.site.register(ConversationReadState)
@@ -0,0 +1,19 @@
+from contextlib import contextmanager
+
+from django.db import connections
+
+
+@contextmanager
+def scratch_database(alias='default', verbosity=0):
+    """
+    Point `alias` at a freshly created and migrated test database for the
+    duration of the block, then destroy it. Benchmarks bulk-create users and
+    rows, so they never run against the configured database.
+    """
+    connection = connections[alias]
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
@@ -0,0 +1,47 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def accomplishment_stats_cache_key(user_id, day=None):
+    # "recent" is relative to today, so entries are per day
+    day = day or timezone.now().date()
+    return f"accomplishment_stats:{user_id}:{day.isoformat()}"
+
+
+def get_accomplishment_stats(user_id):
+    return cache.get(accomplishment_stats_cache_key(user_id))
+
+
+def set_accomplishment_stats(user_id, stats):
+    timeout = getattr(settings, 'ACCOMPLISHMENT_STATS_CACHE_TIMEOUT', 60 * 60 * 24)
+    cache.set(accomplishment_stats_cache_key(user_id), stats, timeout)
+
+
+def invalidate_accomplishment_stats(user_id):
+    cache.delete(accomplishment_stats_cache_key(user_id))
+
+
+COURSE_CATALOG_GENERATION_KEY = 'course_catalog:generation'
+
+
+def course_catalog_cache_key(url):
+    # Every cached page carries the current generation; invalidating starts a new one
+    generation = cache.get_or_set(COURSE_CATALOG_GENERATION_KEY, time.time_ns, None)
+    return f"course_catalog:{generation}:{hashlib.md5(url.encode('utf-8')).hexdigest()}"
+
+
+def get_course_catalog(url):
+    return cache.get(course_catalog_cache_key(url))
+
+
+def set_course_catalog(url, catalog):
+    timeout = getattr(settings, 'COURSE_CATALOG_CACHE_TIMEOUT', 60 * 60)
+    cache.set(course_catalog_cache_key(url), catalog, timeout)
+
+
+def invalidate_course_catalog():
+    cache.set(COURSE_CATALOG_GENERATION_KEY, time.time_ns(), None)
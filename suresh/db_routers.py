@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+REPLICA_ALIAS = 'replica'
+READ_ONLY_ACTIONS = ('list', 'retrieve')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def start_replica_reads(enabled=True):
+    """Route reads to the replica (if one is configured) until stop_replica_reads(token)"""
+    return _use_replica.set(enabled)
+
+
+def stop_replica_reads(token):
+    _use_replica.reset(token)
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """Route reads inside the block to the replica (if one is configured)"""
+    token = start_replica_reads(enabled)
+    try:
+        yield
+    finally:
+        stop_replica_reads(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to the replica only while a
+    read-only viewset action is being served (see ReplicaRoutingMiddleware),
+    so read-after-write inside any other request stays on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and REPLICA_ALIAS in settings.DATABASES:
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
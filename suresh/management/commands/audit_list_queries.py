@@ -0,0 +1,85 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router as db_router
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from suresh.models import CustomUser
+from suresh.urls import router
+
+# Plan fragments that mean "no usable index" per backend
+FULL_SCAN_MARKERS = {
+    'sqlite': ('SCAN ',),
+    'postgresql': ('Seq Scan',),
+}
+SORT_MARKERS = {
+    'sqlite': ('USE TEMP B-TREE',),
+    'postgresql': ('Sort Key',),
+}
+INDEXED_SCAN_MARKERS = ('USING INDEX', 'USING COVERING INDEX', 'USING INTEGER PRIMARY KEY')
+
+class Command(BaseCommand):
+    help = 'EXPLAIN every list endpoint queryset and report full table scans and sorts that miss an index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user to build querysets for (defaults to the first user)')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every endpoint')
+        parser.add_argument('--fail-on-issues', action='store_true', help='Exit with an error if any issue is found')
+
+    def get_user(self, email):
+        if email:
+            return CustomUser.objects.get(email=email)
+        # An unsaved user is enough to build the querysets
+        return CustomUser.objects.order_by('pk').first() or CustomUser(pk=0, email='audit@example.com')
+
+    def get_list_queryset(self, viewset_class, user):
+        view = viewset_class()
+        django_request = APIRequestFactory().get('/')
+        django_request.user = user
+        view.request = Request(django_request)
+        view.request.user = user
+        view.args, view.kwargs, view.format_kwarg = (), {}, None
+        view.action = 'list'
+        return view.filter_queryset(view.get_queryset())
+
+    def find_issues(self, vendor, plan, filtered):
+        issues = []
+        for line in plan.splitlines():
+            if filtered and any(marker in line for marker in FULL_SCAN_MARKERS.get(vendor, ())) \
+                    and not any(marker in line for marker in INDEXED_SCAN_MARKERS):
+                issues.append(f'full scan: {line.strip()}')
+            if any(marker in line for marker in SORT_MARKERS.get(vendor, ())):
+                issues.append(f'sort: {line.strip()}')
+        return issues
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+        total_issues = 0
+
+        for prefix, viewset_class, basename in router.registry:
+            if not hasattr(viewset_class, 'list'):
+                continue
+            try:
+                queryset = self.get_list_queryset(viewset_class, user)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'{prefix}: could not build queryset ({e})'))
+                continue
+
+            vendor = connections[db_router.db_for_read(queryset.model)].vendor
+            plan = queryset.explain()
+            # Unfiltered (catalog-style) endpoints are expected to scan their table
+            filtered = bool(queryset.query.where)
+            issues = self.find_issues(vendor, plan, filtered)
+            total_issues += len(issues)
+
+            if issues:
+                self.stdout.write(self.style.ERROR(f'{prefix}:'))
+                for issue in issues:
+                    self.stdout.write(f'    {issue}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{prefix}: ok'))
+            if options['verbose_plans']:
+                for line in plan.splitlines():
+                    self.stdout.write(f'        {line}')
+
+        if total_issues and options['fail_on_issues']:
+            raise CommandError(f'{total_issues} query plan issue(s) found')
+        self.stdout.write(f'{total_issues} issue(s) found')
@@ -0,0 +1,99 @@
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+from suresh.benchmarking import scratch_database
+from suresh.models import (
+    Assessment,
+    CustomUser,
+    MainGoal,
+    Reward,
+    SubGoal,
+    Survey,
+    SurveyResponse,
+    UserAssessment,
+    UserReward,
+)
+from suresh.views import (
+    MainGoalViewSet,
+    SubGoalViewSet,
+    SurveyResponseViewSet,
+    UserAssessmentViewSet,
+    UserRewardViewSet,
+)
+
+ENDPOINTS = (
+    ('main-goals', MainGoalViewSet),
+    ('sub-goals', SubGoalViewSet),
+    ('survey-responses', SurveyResponseViewSet),
+    ('user-rewards', UserRewardViewSet),
+    ('user-assessments', UserAssessmentViewSet),
+)
+
+
+class Command(BaseCommand):
+    help = 'Time the per-user goal/survey/reward/assessment list endpoints as the platform-wide row count grows, on a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', default='10,100,1000', help='Comma separated total user counts to measure at')
+        parser.add_argument('--rows-per-user', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20, help='Requests per endpoint per step')
+
+    def handle(self, *args, **options):
+        steps = sorted(int(n) for n in options['users'].split(','))
+        rows = options['rows_per_user']
+        factory = APIRequestFactory()
+
+        self.stdout.write(f"{rows} rows per user per table, median of {options['repeat']} requests (ms)")
+        self.stdout.write(f"{'users':>8} " + ' '.join(f'{prefix:>17}' for prefix, _ in ENDPOINTS))
+        with scratch_database():
+            survey = Survey.objects.create(title='bench', description='', questions=[])
+            reward = Reward.objects.create(title='bench', description='', points_required=0, type='badge', image='rewards/bench.png')
+            assessment = Assessment.objects.create(title='bench', description='', questions=[], time_limit=1, passing_score=1)
+            created = 0
+            viewer = None
+            for total in steps:
+                new_users = CustomUser.objects.bulk_create([
+                    CustomUser(email=f'bench-lists-{n}@example.com', username=f'bench-lists-{n}')
+                    for n in range(created, total)
+                ])
+                created = total
+                viewer = viewer or new_users[0]
+                self.populate(new_users, rows, survey, reward, assessment)
+
+                timings = []
+                for prefix, viewset in ENDPOINTS:
+                    view = viewset.as_view({'get': 'list'})
+                    samples = []
+                    for _ in range(options['repeat']):
+                        request = factory.get(f'/api/{prefix}/')
+                        force_authenticate(request, user=viewer)
+                        started = time.perf_counter()
+                        response = view(request)
+                        response.render()
+                        samples.append((time.perf_counter() - started) * 1000)
+                    timings.append(statistics.median(samples))
+                self.stdout.write(f'{total:>8} ' + ' '.join(f'{ms:>17.2f}' for ms in timings))
+
+    def populate(self, users, rows, survey, reward, assessment):
+        today = date.today()
+        goals = MainGoal.objects.bulk_create([
+            MainGoal(user=user, name=f'goal {n}', category='career', start_date=today + timedelta(days=n),
+                     end_date=today + timedelta(days=n + 30), status='active')
+            for user in users for n in range(rows)
+        ])
+        SubGoal.objects.bulk_create([
+            SubGoal(main_goal=goal, name='step', start_date=goal.start_date, end_date=goal.end_date, status='active')
+            for goal in goals
+        ])
+        SurveyResponse.objects.bulk_create([
+            SurveyResponse(survey=survey, user=user, answers={}) for user in users for _ in range(rows)
+        ])
+        UserReward.objects.bulk_create([
+            UserReward(user=user, reward=reward) for user in users for _ in range(rows)
+        ])
+        UserAssessment.objects.bulk_create([
+            UserAssessment(user=user, assessment=assessment, answers={}, score=0) for user in users for _ in range(rows)
+        ])
@@ -0,0 +1,90 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from suresh import search
+from suresh.benchmarking import scratch_database
+from suresh.models import CustomUser, SearchDocument
+
+COMMON_WORDS = (
+    'project', 'team', 'customer', 'report', 'meeting', 'design', 'release', 'budget', 'review', 'launch',
+    'python', 'django', 'database', 'migration', 'interview', 'promotion', 'mentor', 'training', 'sales', 'growth',
+)
+QUERIES = (
+    ('common word', 'project'),
+    ('two words', 'customer release'),
+    ('rare word', 'zylophant'),
+    ('prefix', 'migr'),
+    ('no match', 'qwertyuiop'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Time /api/search/ queries at a given number of documents per user, on a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=100_000, help='Documents per user')
+        parser.add_argument('--users', type=int, default=2, help='Users with that many documents each')
+        parser.add_argument('--repeat', type=int, default=50, help='Runs per query')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--rank-window', type=int, default=None, help='Override SEARCH_RANK_WINDOW (0 ranks every match)')
+
+    def handle(self, *args, **options):
+        if options['rank_window'] is not None:
+            settings.SEARCH_RANK_WINDOW = options['rank_window']
+        with scratch_database() as connection:
+            self.stdout.write(
+                f"backend: {connection.vendor}, FTS5: {search.fts5_available()}, "
+                f"SEARCH_RANK_WINDOW: {getattr(settings, 'SEARCH_RANK_WINDOW', 2000)}"
+            )
+            started = time.perf_counter()
+            users = self.populate(options['users'], options['documents'], options['batch_size'])
+            search.optimize()
+            self.stdout.write(
+                f"indexed {options['users'] * options['documents']} documents in {time.perf_counter() - started:.1f}s"
+            )
+
+            user = users[0]
+            self.stdout.write(f"{'query':<14} {'hits':>5} {'median ms':>10} {'p95 ms':>8}")
+            for label, query in QUERIES:
+                samples = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    results = search.search(user, query, limit=20)
+                    samples.append((time.perf_counter() - started) * 1000)
+                samples.sort()
+                p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+                self.stdout.write(f'{label:<14} {len(results):>5} {statistics.median(samples):>10.2f} {p95:>8.2f}')
+
+    def populate(self, user_count, documents, batch_size):
+        rng = random.Random(0)
+        # A long tail of generated words, with a few common ones mixed in
+        vocabulary = [
+            ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10))) for _ in range(20_000)
+        ]
+        vocabulary.append('zylophant')
+        weights = [1] * len(vocabulary)
+        vocabulary.extend(COMMON_WORDS)
+        weights.extend([200] * len(COMMON_WORDS))
+        cum_weights = list(itertools.accumulate(weights))
+
+        users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'bench-search-{n}@example.com', username=f'bench-search-{n}') for n in range(user_count)
+        ])
+        doc_types = [doc_type for doc_type, _ in SearchDocument.DOC_TYPES]
+        for user in users:
+            for start in range(0, documents, batch_size):
+                SearchDocument.objects.bulk_create([
+                    SearchDocument(
+                        user=user,
+                        doc_type=doc_types[n % len(doc_types)],
+                        object_id=user.pk * 10_000_000 + n,
+                        title=' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=6)),
+                        body=' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=80)),
+                    )
+                    for n in range(start, min(start + batch_size, documents))
+                ])
+        return users
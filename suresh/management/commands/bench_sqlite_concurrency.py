@@ -0,0 +1,130 @@
+import multiprocessing
+import os
+import queue
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# A worker gives up creating its user after this many "database is locked" retries
+SETUP_ATTEMPTS = 100
+
+MODES = (
+    ('sqlite defaults', 'off'),
+    ('tuned pragmas (WAL)', 'on'),
+)
+
+
+def _worker(db_url, tuning, worker_id, requests, write_ratio, start_at, results):
+    # Runs in a fresh (spawned) process, like a separate gunicorn worker
+    os.environ['DATABASE_URL'] = db_url
+    os.environ['SQLITE_TUNING'] = tuning
+    os.environ.pop('DATABASE_REPLICA_URL', None)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sureshproject.settings')
+
+    import django
+    django.setup()
+
+    from rest_framework.test import APIClient
+    from suresh.models import CustomUser
+    from suresh.provisioning import provision_user
+
+    for attempt in range(SETUP_ATTEMPTS):
+        try:
+            user = CustomUser.objects.create_user(
+                email=f'bench{worker_id}@example.com', username=f'bench{worker_id}', password=None
+            )
+            provision_user(user)
+            break
+        except Exception:
+            if attempt == SETUP_ATTEMPTS - 1:
+                raise
+            time.sleep(0.05)
+
+    client = APIClient(HTTP_HOST='localhost')
+    client.force_authenticate(user)
+    rng = random.Random(worker_id)
+
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    ok = errors = 0
+    started = time.perf_counter()
+    for i in range(requests):
+        try:
+            if rng.random() < write_ratio:
+                response = client.post('/api/notes/', {
+                    'user': user.id, 'title': f'note {i}', 'content': 'x' * 200, 'tags': ['bench'],
+                }, format='json')
+            elif i % 2:
+                response = client.get('/api/notes/')
+            else:
+                response = client.get('/api/settings/')
+            if response.status_code < 400:
+                ok += 1
+            else:
+                errors += 1
+        except Exception:
+            # "database is locked" surfaces as OperationalError
+            errors += 1
+    results.put((ok, errors, time.perf_counter() - started))
+
+
+class Command(BaseCommand):
+    help = 'Compare API throughput on sqlite with and without the SQLITE_PRAGMAS tuning under concurrent workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=200, help='Requests per worker')
+        parser.add_argument('--write-ratio', type=float, default=0.3)
+        parser.add_argument('--timeout', type=int, default=300, help='Seconds to wait for the workers of each mode')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        requests = options['requests']
+        write_ratio = options['write_ratio']
+        context = multiprocessing.get_context('spawn')
+
+        self.stdout.write(
+            f"{workers} workers x {requests} requests, {int(write_ratio * 100)}% writes"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, tuning in MODES:
+                db_url = f"sqlite:///{Path(tmp) / f'bench_{tuning}.sqlite3'}"
+                env = dict(os.environ, DATABASE_URL=db_url, SQLITE_TUNING=tuning)
+                env.pop('DATABASE_REPLICA_URL', None)
+                subprocess.run(
+                    [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), 'migrate', '-v', '0'],
+                    env=env, check=True,
+                )
+
+                results = context.Queue()
+                start_at = time.time() + 3
+                processes = [
+                    context.Process(target=_worker, args=(db_url, tuning, n, requests, write_ratio, start_at, results))
+                    for n in range(workers)
+                ]
+                for process in processes:
+                    process.start()
+                deadline = time.time() + options['timeout']
+                try:
+                    rows = [results.get(timeout=max(deadline - time.time(), 0)) for _ in processes]
+                except queue.Empty:
+                    failed = sum(1 for process in processes if process.exitcode not in (0, None))
+                    for process in processes:
+                        process.terminate()
+                    raise CommandError(f'{label}: workers did not finish ({failed} exited with an error)')
+                for process in processes:
+                    process.join()
+
+                ok = sum(row[0] for row in rows)
+                errors = sum(row[1] for row in rows)
+                elapsed = max(row[2] for row in rows)
+                self.stdout.write(
+                    f"{label:<22} {ok / elapsed:8.1f} req/s  {ok:6d} ok  {errors:5d} failed  {elapsed:6.2f}s"
+                )
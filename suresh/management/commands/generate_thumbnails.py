@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from suresh.thumbnails import THUMBNAIL_FIELDS, process_image
+
+class Command(BaseCommand):
+    help = (
+        'Generate missing thumbnails for profile pictures and reward images, e.g. after changing '
+        'THUMBNAIL_SIZES or after a restart dropped queued thumbnail jobs'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Also reprocess images that already have thumbnails')
+
+    def handle(self, *args, **options):
+        for model, (field, hash_field) in THUMBNAIL_FIELDS.items():
+            queryset = model.objects.exclude(Q(**{f'{field}__isnull': True}) | Q(**{field: ''}))
+            if not options['all']:
+                queryset = queryset.filter(**{hash_field: ''})
+            processed = failed = 0
+            for pk, name in queryset.values_list('pk', field).iterator():
+                if process_image(model, pk, name):
+                    processed += 1
+                else:
+                    failed += 1
+            self.stdout.write(self.style.SUCCESS(f'{model.__name__}: {processed} processed, {failed} failed'))
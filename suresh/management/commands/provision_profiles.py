@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from suresh.models import CustomUser
+from suresh.provisioning import provision_users
+
+class Command(BaseCommand):
+    help = 'Create missing personal, global, professional and settings rows for existing users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # Users missing at least one of their singleton rows
+        missing = CustomUser.objects.filter(
+            Q(personalinformation__isnull=True)
+            | Q(globalinformation__isnull=True)
+            | Q(professionalinformation__isnull=True)
+            | Q(settings__isnull=True)
+        ).order_by('pk')
+
+        provisioned = 0
+        last_pk = 0
+        while True:
+            batch = list(missing.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            provision_users(batch)
+            provisioned += len(batch)
+            last_pk = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f'Provisioned {provisioned} users'))
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from suresh.models import ChunkedUpload
+from suresh.uploads import discard_upload
+
+class Command(BaseCommand):
+    help = 'Delete chunked uploads that were never completed, along with their partial files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=48, help='Only purge uploads idle for this long')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        # Includes 'receiving' / 'completing' claims whose worker never finished
+        stale = ChunkedUpload.objects.exclude(status='complete').filter(updated_at__lt=cutoff)
+        count = 0
+        for upload in stale.iterator():
+            discard_upload(upload)
+            upload.delete()
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Purged {count} stale upload(s)'))
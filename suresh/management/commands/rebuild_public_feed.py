@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from suresh.models import RecentPublicAccomplishment
+
+class Command(BaseCommand):
+    help = 'Rebuild the recent public accomplishment feed table from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=None, help='Defaults to PUBLIC_FEED_WINDOW')
+
+    def handle(self, *args, **options):
+        window = options['window'] or settings.PUBLIC_FEED_WINDOW
+        if not window:
+            self.stdout.write('PUBLIC_FEED_WINDOW is 0; the feed is served from the accomplishment table')
+            return
+        RecentPublicAccomplishment.rebuild(window)
+        count = RecentPublicAccomplishment.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Public feed rebuilt with {count} entries'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from suresh import search
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for notes, work items, accomplishments and jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = search.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} documents'))
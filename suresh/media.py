@@ -0,0 +1,151 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.static import serve
+
+STREAM_TOKEN_SALT = 'suresh.media.stream'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def make_stream_token(lecture, user):
+    """Signed playback token; the purchase check happens once, when it is issued"""
+    return signing.dumps({'l': lecture.pk, 'u': user.pk, 'f': lecture.video_file.name}, salt=STREAM_TOKEN_SALT)
+
+
+def read_stream_token(token):
+    """Payload of a valid, unexpired token, otherwise None"""
+    max_age = getattr(settings, 'MEDIA_STREAM_TOKEN_MAX_AGE', 6 * 60 * 60)
+    try:
+        return signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+
+
+def is_protected_media(name):
+    """Whether a MEDIA_ROOT relative path is only available through a stream token"""
+    name = posixpath.normpath(name).lstrip('/')
+    return any(name.startswith(prefix) for prefix in getattr(settings, 'PROTECTED_MEDIA_PREFIXES', ()))
+
+
+def serve_public_media(request, path):
+    """Development media view: django.views.static.serve minus PROTECTED_MEDIA_PREFIXES"""
+    if is_protected_media(path):
+        raise Http404
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to serve the whole
+    file (no header, or one we don't handle such as multiple ranges), or
+    ValueError if the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # "bytes=-500" is the last 500 bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+class RangeFile:
+    """
+    A file limited to one byte range.
+
+    read() stops at the end of the range, and fileno() lets a WSGI server's
+    file_wrapper (gunicorn, uWSGI) sendfile() the range straight from the page
+    cache; the file position and Content-Length tell it where and how much.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def offload_response(path, name, content_type):
+    """Let the front-end server (nginx / Apache, lighttpd) send the file and handle ranges itself"""
+    mode = getattr(settings, 'MEDIA_STREAM_OFFLOAD', '')
+    response = HttpResponse(content_type=content_type)
+    if mode == 'x-accel-redirect':
+        prefix = getattr(settings, 'MEDIA_STREAM_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix + quote(name)
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+def serve_file(request, path, name):
+    """
+    Serve a file from local storage with byte ranges, ETag/Last-Modified
+    validators and If-Range, or hand it to the front-end server when
+    MEDIA_STREAM_OFFLOAD is set.
+    """
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if getattr(settings, 'MEDIA_STREAM_OFFLOAD', ''):
+        return offload_response(path, name, content_type)
+
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        byte_range = None
+        if_range = request.headers.get('If-Range')
+        # A stale If-Range means the client's partial copy is outdated: send it all
+        if not if_range or if_range == etag or parse_http_date_safe(if_range) == last_modified:
+            try:
+                byte_range = parse_range(request.headers.get('Range'), size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+
+        start, end = byte_range or (0, size - 1)
+        length = end - start + 1 if size else 0
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+        else:
+            response = FileResponse(RangeFile(open(path, 'rb'), start, length), content_type=content_type)
+        if byte_range:
+            response.status_code = 206
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, max_age=getattr(settings, 'MEDIA_STREAM_TOKEN_MAX_AGE', 6 * 60 * 60))
+    return response
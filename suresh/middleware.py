@@ -0,0 +1,29 @@
+from .db_routers import READ_ONLY_ACTIONS, start_replica_reads, stop_replica_reads
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve viewset list/retrieve actions from the read replica.
+
+    process_view only switches reads to the replica; the regular handler still
+    calls the view (so other middleware and ATOMIC_REQUESTS apply as usual),
+    and __call__ switches back once the response is built.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            token = getattr(request, '_replica_reads_token', None)
+            if token is not None:
+                stop_replica_reads(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # ViewSet.as_view() exposes its method -> action mapping on the view function
+        actions = getattr(view_func, 'actions', None) or {}
+        if actions.get(request.method.lower()) in READ_ONLY_ACTIONS:
+            request._replica_reads_token = start_replica_reads()
+        return None
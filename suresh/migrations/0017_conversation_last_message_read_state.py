@@ -0,0 +1,60 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_inbox_state(apps, schema_editor):
+    Conversation = apps.get_model('suresh', 'Conversation')
+    ConversationReadState = apps.get_model('suresh', 'ConversationReadState')
+    Message = apps.get_model('suresh', 'Message')
+
+    for conversation in Conversation.objects.prefetch_related('participants'):
+        last = Message.objects.filter(conversation=conversation).order_by('-created_at', '-id').first()
+        if last:
+            conversation.last_message = last
+            conversation.last_message_at = last.created_at
+            conversation.save(update_fields=['last_message', 'last_message_at'])
+
+        for user in conversation.participants.all():
+            unread = Message.objects.filter(
+                conversation=conversation, is_read=False
+            ).exclude(sender=user).count()
+            ConversationReadState.objects.get_or_create(
+                conversation=conversation, user=user, defaults={'unread_count': unread}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0016_message_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='suresh.message'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ConversationReadState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('last_read_at', models.DateTimeField(blank=True, null=True)),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_states', to='suresh.conversation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_read_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('conversation', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_inbox_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# (M2M field on ProfessionalInformation, section model)
+SECTIONS = [
+    ('work_experiences', 'WorkExperience'),
+    ('previous_experiences', 'PreviousExperience'),
+    ('educations', 'Education'),
+    ('language_skills', 'LanguageSkill'),
+    ('certificates', 'Certificate'),
+    ('honors_awards_publications', 'HonorsAwardsPublications'),
+    ('functional_skills', 'FunctionalSkill'),
+    ('technical_skills', 'TechnicalSkill'),
+]
+
+def fold_m2m_into_fk(apps, schema_editor):
+    ProfessionalInformation = apps.get_model('suresh', 'ProfessionalInformation')
+
+    # Items only linked through the M2M never showed up in the section
+    # viewsets; attach them to their profile through the FK instead.
+    for field_name, model_name in SECTIONS:
+        Section = apps.get_model('suresh', model_name)
+        through = getattr(ProfessionalInformation, field_name).through
+        section_column = f"{model_name.lower()}_id"
+        for link in through.objects.all().order_by('pk'):
+            Section.objects.filter(
+                pk=getattr(link, section_column), professional_info__isnull=True
+            ).update(professional_info_id=link.professionalinformation_id)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0017_conversation_last_message_read_state'),
+    ]
+
+    operations = [
+        migrations.RunPython(fold_m2m_into_fk, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0018_fold_professional_m2m_into_fk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalinformation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='professionalinformation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
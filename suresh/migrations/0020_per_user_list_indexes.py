@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0019_profile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accomplishment',
+            index=models.Index(fields=['user', '-date', '-created_at'], name='accomplishment_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['user', '-date', '-created_at'], name='activity_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['user', '-created_at'], name='habit_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moodtracking',
+            index=models.Index(fields=['user', '-date', '-created_at'], name='mood_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', '-is_pinned', '-updated_at'], name='note_user_pinned_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', '-start_time'], name='timeentry_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userjob',
+            index=models.Index(fields=['user', '-created'], name='userjob_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0020_per_user_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecentPublicAccomplishment',
+            fields=[
+                ('accomplishment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recent_public_entry', serialize=False, to='suresh.accomplishment')),
+                ('category', models.CharField(max_length=20)),
+                ('date', models.DateField()),
+                ('created_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='accomplishment',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-date', '-created_at', '-id'], name='accomplishment_public_feed_idx'),
+        ),
+        migrations.AddField(
+            model_name='recentpublicaccomplishment',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='recentpublicaccomplishment',
+            index=models.Index(fields=['-date', '-created_at', '-accomplishment'], name='recent_public_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _normalized(values):
+    seen = []
+    for value in values or []:
+        if isinstance(value, (str, int, float)):
+            value = str(value).strip().lower()[:100]
+            if value and value not in seen:
+                seen.append(value)
+    return seen
+
+def backfill_tag_index(apps, schema_editor):
+    Accomplishment = apps.get_model('suresh', 'Accomplishment')
+    Note = apps.get_model('suresh', 'Note')
+    TagIndexEntry = apps.get_model('suresh', 'TagIndexEntry')
+
+    entries = []
+    for accomplishment in Accomplishment.objects.only('id', 'user_id', 'tags', 'skills_used').iterator():
+        for kind, values in (('tag', accomplishment.tags), ('skill', accomplishment.skills_used)):
+            entries.extend(
+                TagIndexEntry(user_id=accomplishment.user_id, kind=kind, value=value, accomplishment_id=accomplishment.id)
+                for value in _normalized(values)
+            )
+    for note in Note.objects.only('id', 'user_id', 'tags').iterator():
+        entries.extend(
+            TagIndexEntry(user_id=note.user_id, kind='tag', value=value, note_id=note.id)
+            for value in _normalized(note.tags)
+        )
+    TagIndexEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0021_public_accomplishment_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('tag', 'Tag'), ('skill', 'Skill')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('accomplishment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tag_entries', to='suresh.accomplishment')),
+                ('note', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tag_entries', to='suresh.note')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'kind', 'value'], name='tagindex_user_kind_value_idx'), models.Index(fields=['kind', 'value'], name='tagindex_kind_value_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_tag_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+FTS_TABLE = 'suresh_search_fts'
+
+SQLITE_FTS_SQL = [
+    # Own-content FTS5 table (it stores its own copy of the text) keyed by
+    # SearchDocument.id. It can't be external-content: "owner" holds u<user_id>,
+    # which has no matching column in suresh_searchdocument, so the user's
+    # documents are narrowed inside the index itself. The triggers below are
+    # the only thing that writes to it.
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(owner, title, body, tokenize='porter unicode61')",
+    f"""CREATE TRIGGER suresh_searchdocument_ai AFTER INSERT ON suresh_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, owner, title, body) VALUES (new.id, 'u' || new.user_id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER suresh_searchdocument_ad AFTER DELETE ON suresh_searchdocument BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER suresh_searchdocument_au AFTER UPDATE ON suresh_searchdocument BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, owner, title, body) VALUES (new.id, 'u' || new.user_id, new.title, new.body);
+    END""",
+]
+
+SQLITE_FTS_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS suresh_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS suresh_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS suresh_searchdocument_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# Same expression search.py builds with SearchVector(..., config='english')
+POSTGRES_INDEX_SQL = """
+    CREATE INDEX searchdoc_fts_idx ON suresh_searchdocument USING GIN ((
+        setweight(to_tsvector('english'::regconfig, COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, COALESCE(body, '')), 'B')
+    ))
+"""
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # search.py falls back to plain LIKE matching
+                return
+        for sql in SQLITE_FTS_SQL:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_INDEX_SQL)
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_FTS_DROP_SQL:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS searchdoc_fts_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0022_tag_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_type', models.CharField(choices=[('note', 'Note'), ('work_item', 'Work Item'), ('accomplishment', 'Accomplishment'), ('job', 'Job')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'doc_type'], name='searchdoc_user_type_idx')],
+                'unique_together': {('doc_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
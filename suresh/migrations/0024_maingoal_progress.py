@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+def backfill_progress(apps, schema_editor):
+    MainGoal = apps.get_model('suresh', 'MainGoal')
+    SubGoal = apps.get_model('suresh', 'SubGoal')
+    totals = {}
+    for main_goal_id, required, spent in SubGoal.objects.values_list('main_goal_id', 'required_effort', 'spent_effort'):
+        total_required, total_done = totals.get(main_goal_id, (0, 0))
+        totals[main_goal_id] = (total_required + required, total_done + min(spent, required))
+    for main_goal_id, (total_required, total_done) in totals.items():
+        if total_required > 0:
+            MainGoal.objects.filter(pk=main_goal_id).update(progress=total_done * 100.0 / total_required)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0023_search_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maingoal',
+            name='progress',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
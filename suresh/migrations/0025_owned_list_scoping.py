@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0024_maingoal_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maingoal',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='main_goals', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='maingoal',
+            index=models.Index(fields=['user', 'start_date'], name='maingoal_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='surveyresponse',
+            index=models.Index(fields=['user', '-submitted_at', '-id'], name='surveyresponse_user_sub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userassessment',
+            index=models.Index(fields=['user', '-completed_at', '-id'], name='userassessment_user_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userreward',
+            index=models.Index(fields=['user', '-earned_at', '-id'], name='userreward_user_earned_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0026_chunked_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalinformation',
+            name='profile_picture_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='reward',
+            name='image_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0027_image_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subgoal',
+            name='main_goal',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='subgoals', to='suresh.maingoal'),
+        ),
+        migrations.AddIndex(
+            model_name='subgoal',
+            index=models.Index(fields=['main_goal', 'start_date', 'id'], name='subgoal_goal_start_idx'),
+        ),
+    ]
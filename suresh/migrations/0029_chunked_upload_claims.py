@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0028_subgoal_goal_start_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chunkedupload',
+            name='status',
+            field=models.CharField(choices=[('uploading', 'Uploading'), ('receiving', 'Receiving a chunk'), ('completing', 'Completing'), ('complete', 'Complete')], default='uploading', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='chunkedupload',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='chunkedupload_user_created_idx'),
+        ),
+    ]
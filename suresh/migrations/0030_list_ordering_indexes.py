@@ -0,0 +1,76 @@
+# Generated by Django 5.0.6 on 2026-10-18 11:59
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_list_columns(apps, schema_editor):
+    Accomplishment = apps.get_model('suresh', 'Accomplishment')
+    AccomplishmentShare = apps.get_model('suresh', 'AccomplishmentShare')
+    Conversation = apps.get_model('suresh', 'Conversation')
+    ConversationReadState = apps.get_model('suresh', 'ConversationReadState')
+
+    AccomplishmentShare.objects.update(user=Subquery(
+        Accomplishment.objects.filter(pk=OuterRef('accomplishment')).values('user')[:1]
+    ))
+
+    # Every participant needs a read state to see the conversation in their inbox
+    for conversation in Conversation.objects.prefetch_related('participants'):
+        ConversationReadState.objects.bulk_create(
+            [ConversationReadState(conversation=conversation, user=user) for user in conversation.participants.all()],
+            ignore_conflicts=True
+        )
+    ConversationReadState.objects.update(last_activity_at=Subquery(
+        Conversation.objects.filter(pk=OuterRef('conversation'))
+        .values(activity=Coalesce('last_message_at', 'created_at'))[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suresh', '0029_chunked_upload_claims'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='accomplishmentshare',
+            options={'ordering': ['-shared_at', '-id']},
+        ),
+        migrations.AlterModelOptions(
+            name='coach',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Coach', 'verbose_name_plural': 'Coaches'},
+        ),
+        migrations.AddField(
+            model_name='accomplishmentshare',
+            name='user',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversationreadstate',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_list_columns, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='accomplishmentshare',
+            name='user',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='accomplishmentshare',
+            index=models.Index(fields=['user', '-shared_at', '-id'], name='share_user_shared_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coach',
+            index=models.Index(fields=['-created_at', '-id'], name='coach_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversationreadstate',
+            index=models.Index(fields=['user', '-last_activity_at', '-conversation'], name='readstate_user_activity_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Sum
+from django.db.models.functions import Coalesce, Least, NullIf
 import json
+import os
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth.models import AbstractUser, BaseUserManager, PermissionsMixin
@@ -44,6 +47,8 @@ class CustomUser(AbstractUser):
 class PersonalInformation(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)  # New field
+    # SHA-256 of the picture once its thumbnails exist (see suresh/thumbnails.py)
+    profile_picture_hash = models.CharField(max_length=64, blank=True, editable=False)
     first_name = models.CharField(max_length=30,blank=True,null=True)
     middle_name = models.CharField(max_length=30, blank=True,null=True)
     last_name = models.CharField(max_length=30,blank=True,null=True)
@@ -59,6 +64,7 @@ class PersonalInformation(models.Model):
     country = models.CharField(max_length=30,blank=True,null=True)
     state = models.CharField(max_length=30,blank=True,null=True)
     city = models.CharField(max_length=30,blank=True,null=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     def __str__(self):
      return self.first_name if self.first_name else "Unnamed Person"
@@ -91,6 +97,25 @@ class GlobalInformation(models.Model):
             self.social_media_links = {}
         super().save(*args, **kwargs)
 
+class ProfessionalInformationQuerySet(models.QuerySet):
+    # Reverse FK relations holding each profile section. The section viewsets
+    # write through these, so they are the source of truth; the M2M fields
+    # below are only kept for older rows and are folded in by migration 0018.
+    SECTION_RELATIONS = (
+        'work_experiences_set',
+        'previous_experience',
+        'educations_set',
+        'language_skills_set',
+        'certificates_set',
+        'honors_awards_set',
+        'functional_skills_set',
+        'technical_skills_set',
+    )
+
+    def with_sections(self):
+        """Load every section up front: one query for the profile plus one per section"""
+        return self.prefetch_related(*self.SECTION_RELATIONS)
+
 # Professional Information Model
 class ProfessionalInformation(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
@@ -102,6 +127,10 @@ class ProfessionalInformation(models.Model):
     honors_awards_publications = models.ManyToManyField('HonorsAwardsPublications', blank=True, related_name='professional_informations')
     functional_skills = models.ManyToManyField('FunctionalSkill', blank=True)
     technical_skills = models.ManyToManyField('TechnicalSkill', blank=True)
+    # Also bumped whenever one of the section rows changes (see signals.py)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+
+    objects = ProfessionalInformationQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.user.first_name}'s Professional Info"
@@ -232,21 +261,65 @@ class WorkItem(models.Model):
 
     def __str__(self):
         return f"{self.title} ({self.work_type}) - {self.user.email}"
+class SwotAnalysisQuerySet(models.QuerySet):
+    QUADRANT_RELATIONS = ('strengths', 'weaknesses', 'opportunities', 'threats')
+
+    def with_quadrants(self):
+        """One query for the analyses plus one per quadrant, however many analyses"""
+        return self.prefetch_related(*self.QUADRANT_RELATIONS)
+
+    def create_with_entries(self, user, entries):
+        """
+        Create an analysis whose quadrants hold the default entry followed by
+        `entries` ({related_name: [description, ...]}), one insert per quadrant.
+        """
+        analysis = self.model(user=user)
+        with transaction.atomic(using=self.db):
+            # Model.save() rather than SwotAnalysis.save(), which would insert the defaults on their own
+            super(SwotAnalysis, analysis).save(using=self.db)
+            analysis.add_entries(analysis.initial_entries(entries))
+        return analysis
+
 class SwotAnalysis(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='swot_analyses')
 
+    objects = SwotAnalysisQuerySet.as_manager()
+
     def __str__(self):
         return f"SWOT Analysis for {self.user.email}"
 
+    @staticmethod
+    def quadrant_models():
+        # related_name -> (model, default entry) for each SWOT component
+        return {
+            'strengths': (Strength, "Default Strength"),
+            'weaknesses': (Weakness, "Default Weakness"),
+            'opportunities': (Opportunity, "Default Opportunity"),
+            'threats': (Threat, "Default Threat"),
+        }
+
     def save(self, *args, **kwargs):
-        creating = not self.pk  # Check if this is a new instance
-        super().save(*args, **kwargs)
-        if creating:
-            # Create default entries for SWOT components
-            Strength.objects.create(swot_analysis=self, description="Default Strength")
-            Weakness.objects.create(swot_analysis=self, description="Default Weakness")
-            Opportunity.objects.create(swot_analysis=self, description="Default Opportunity")
-            Threat.objects.create(swot_analysis=self, description="Default Threat")
+        creating = self._state.adding  # Check if this is a new instance
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if creating:
+                # Create default entries for SWOT components
+                self.add_entries(self.initial_entries())
+
+    @classmethod
+    def initial_entries(cls, entries=None):
+        """Every quadrant's default entry, followed by any supplied {related_name: [description, ...]}"""
+        entries = entries or {}
+        return {
+            related_name: [default, *entries.get(related_name, ())]
+            for related_name, (_, default) in cls.quadrant_models().items()
+        }
+
+    def add_entries(self, entries):
+        """Append {related_name: [description, ...]} to the quadrants: one insert per quadrant"""
+        for related_name, descriptions in entries.items():
+            model, _ = self.quadrant_models()[related_name]
+            model.objects.bulk_create([model(swot_analysis=self, description=description) for description in descriptions])
 
 class Strength(models.Model):
     swot_analysis = models.ForeignKey(SwotAnalysis, on_delete=models.CASCADE, related_name='strengths')
@@ -291,6 +364,30 @@ class Threat(models.Model):
     def __str__(self):
         return self.description
 
+def subgoal_progress(prefix=''):
+    """Percent complete of one subgoal: spent effort over required effort, capped at 100"""
+    required = models.F(f'{prefix}required_effort')
+    return models.Case(
+        models.When(**{f'{prefix}required_effort__gt': 0}, then=Least(models.F(f'{prefix}spent_effort'), required) * 100.0 / required),
+        default=models.Value(0.0),
+        output_field=models.FloatField(),
+    )
+
+class MainGoalQuerySet(models.QuerySet):
+    def with_progress(self):
+        """
+        Annotate `live_progress`: completion across all subgoals, weighted by
+        their required effort, aggregated in SQL.
+        """
+        return self.annotate(
+            live_progress=Coalesce(
+                Sum(Least(models.F('subgoals__spent_effort'), models.F('subgoals__required_effort'))) * 100.0
+                / NullIf(Sum('subgoals__required_effort'), models.Value(0.0)),
+                models.Value(0.0),
+                output_field=models.FloatField(),
+            )
+        )
+
 class MainGoal(models.Model):
     GOAL_CATEGORIES = [
         ('spiritual', 'Spiritual Goals'),
@@ -302,6 +399,11 @@ class MainGoal(models.Model):
         ('intellectual', 'Intellectual Goals')
     ]
 
+    # Nullable for goals created before goals were scoped to their owner. Nothing
+    # recorded who those belong to, so they can't be backfilled: the API lists no
+    # ownerless goals (nor their subgoals) until an owner is set in the admin,
+    # which can filter on an empty user.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='main_goals', null=True, blank=True)
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     category = models.CharField(max_length=20, choices=GOAL_CATEGORIES)
@@ -309,13 +411,29 @@ class MainGoal(models.Model):
     end_date = models.DateField()
     status = models.CharField(max_length=50)
     weightage = models.FloatField(default=1.0)
+    # Cached copy of the live rollup, refreshed whenever a subgoal changes
+    progress = models.FloatField(default=0)
+
+    objects = MainGoalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'start_date'], name='maingoal_user_start_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def refresh_progress(cls, *pks):
+        """Recompute the cached progress column of the given goals"""
+        for pk, live_progress in cls.objects.filter(pk__in=pks).with_progress().values_list('pk', 'live_progress'):
+            cls.objects.filter(pk=pk).update(progress=live_progress)
+
 # SubGoal Model
 class SubGoal(models.Model):
-    main_goal = models.ForeignKey(MainGoal, related_name='subgoals', on_delete=models.CASCADE)
+    # Indexed by subgoal_goal_start_idx, which also serves the list ordering
+    main_goal = models.ForeignKey(MainGoal, related_name='subgoals', on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     start_date = models.DateField()
@@ -326,8 +444,23 @@ class SubGoal(models.Model):
     coach = models.CharField(max_length=255, blank=True, null=True)
     accomplishment = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['main_goal', 'start_date', 'id'], name='subgoal_goal_start_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} (SubGoal of {self.main_goal.name})"
+class CourseQuerySet(models.QuerySet):
+    def with_purchase_status(self, user):
+        """Annotate `is_purchased` for the given user with an EXISTS subquery"""
+        purchases = Course.purchasers.through.objects.filter(course_id=models.OuterRef('pk'), customuser_id=user.pk)
+        return self.annotate(is_purchased=models.Exists(purchases))
+
+    def with_lectures(self):
+        """Lectures and their quizzes in two extra queries, however many courses"""
+        return self.prefetch_related('course_lectures__quizzes')
+
 class Course(models.Model):
     title = models.CharField(max_length=255)
     instructor = models.ForeignKey(
@@ -342,6 +475,8 @@ class Course(models.Model):
     is_active = models.BooleanField(default=True)
     purchasers = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='purchased_courses')
 
+    objects = CourseQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -412,6 +547,11 @@ class Habit(models.Model):
     streak = models.IntegerField(default=0)
     last_completed = models.DateField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='habit_user_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.user.email}"
 
@@ -453,6 +593,11 @@ class SurveyResponse(models.Model):
     answers = models.JSONField()
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-submitted_at', '-id'], name='surveyresponse_user_sub_idx'),
+        ]
+
 # Reward Model
 class Reward(models.Model):
     title = models.CharField(max_length=255)
@@ -460,12 +605,18 @@ class Reward(models.Model):
     points_required = models.IntegerField()
     type = models.CharField(max_length=50)  # badge, trophy, etc.
     image = models.ImageField(upload_to='rewards/')
+    image_hash = models.CharField(max_length=64, blank=True, editable=False)
 
 class UserReward(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     reward = models.ForeignKey(Reward, on_delete=models.CASCADE)
     earned_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-earned_at', '-id'], name='userreward_user_earned_idx'),
+        ]
+
 # Time Entry Model
 class TimeEntry(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -475,6 +626,11 @@ class TimeEntry(models.Model):
     category = models.CharField(max_length=50)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-start_time'], name='timeentry_user_start_idx'),
+        ]
+
 # Note Model
 class Note(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -485,6 +641,11 @@ class Note(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-is_pinned', '-updated_at'], name='note_user_pinned_updated_idx'),
+        ]
+
 # Credit Score Model
 class CreditScore(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -509,6 +670,11 @@ class UserAssessment(models.Model):
     score = models.IntegerField()
     completed_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-completed_at', '-id'], name='userassessment_user_done_idx'),
+        ]
+
 # Resume Model
 class Resume(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -561,6 +727,11 @@ class Activity(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)  # Add created_at field
     updated_at = models.DateTimeField(auto_now=True)      # Add updated_at field
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-date', '-created_at'], name='activity_user_date_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -621,9 +792,12 @@ class Coach(models.Model):
         super().save(*args, **kwargs)
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         verbose_name = 'Coach'
         verbose_name_plural = 'Coaches'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='coach_created_idx'),
+        ]
 
 class CoachRequest(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -662,6 +836,9 @@ class MoodTracking(models.Model):
     class Meta:
         ordering = ['-date', '-created_at']
         unique_together = ['user', 'date']  # One mood entry per user per day
+        indexes = [
+            models.Index(fields=['user', '-date', '-created_at'], name='mood_user_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email}'s mood on {self.date}: {self.current_mood}"
@@ -696,6 +873,15 @@ class Accomplishment(models.Model):
     class Meta:
         ordering = ['-date', '-created_at']
         verbose_name = 'Accomplishment'
+        indexes = [
+            models.Index(fields=['user', '-date', '-created_at'], name='accomplishment_user_date_idx'),
+            # Public feed: only public rows, already in feed order
+            models.Index(
+                fields=['-date', '-created_at', '-id'],
+                condition=models.Q(is_public=True),
+                name='accomplishment_public_feed_idx',
+            ),
+        ]
         verbose_name_plural = 'Accomplishments'
 
     def __str__(self):
@@ -713,6 +899,79 @@ class Accomplishment(models.Model):
             self.external_links = []
         super().save(*args, **kwargs)
 
+class RecentPublicAccomplishment(models.Model):
+    """
+    The newest PUBLIC_FEED_WINDOW public accomplishments, kept current on save
+    (see signals.py). When enabled the public feed pages over this bounded
+    table instead of the whole accomplishment history.
+    """
+    accomplishment = models.OneToOneField(
+        Accomplishment, on_delete=models.CASCADE, primary_key=True, related_name='recent_public_entry'
+    )
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.CharField(max_length=20)
+    date = models.DateField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date', '-created_at', '-accomplishment'], name='recent_public_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"Public feed entry for accomplishment {self.accomplishment_id}"
+
+    @classmethod
+    def entry_for(cls, accomplishment):
+        return cls(
+            accomplishment=accomplishment,
+            user_id=accomplishment.user_id,
+            category=accomplishment.category,
+            date=accomplishment.date,
+            created_at=accomplishment.created_at,
+        )
+
+    @classmethod
+    def refresh_for(cls, accomplishment, window):
+        """Update one accomplishment's entry, then re-select which accomplishments belong in the window"""
+        with transaction.atomic():
+            if accomplishment.is_public:
+                cls.objects.filter(pk=accomplishment.pk).update(
+                    user_id=accomplishment.user_id,
+                    category=accomplishment.category,
+                    date=accomplishment.date,
+                    created_at=accomplishment.created_at,
+                )
+            cls.sync(window)
+
+    @classmethod
+    def sync(cls, window):
+        """
+        Make the table hold exactly the newest `window` public accomplishments:
+        drop entries that fell out (made private, deleted, pushed past the
+        window) and backfill from the accomplishment table's public feed index.
+        """
+        newest = list(
+            Accomplishment.objects.filter(is_public=True)
+            .order_by('-date', '-created_at', '-id')
+            .values_list('id', flat=True)[:window]
+        )
+        cls.objects.exclude(pk__in=newest).delete()
+        present = set(cls.objects.values_list('pk', flat=True))
+        missing = [pk for pk in newest if pk not in present]
+        if missing:
+            # A concurrent save may have backfilled the same rows since `present` was read
+            cls.objects.bulk_create([
+                cls.entry_for(accomplishment) for accomplishment in Accomplishment.objects.filter(pk__in=missing)
+            ], ignore_conflicts=True)
+
+    @classmethod
+    def rebuild(cls, window):
+        recent = Accomplishment.objects.filter(is_public=True).order_by('-date', '-created_at', '-id')[:window]
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([cls.entry_for(accomplishment) for accomplishment in recent])
+
 class AccomplishmentShare(models.Model):
     PLATFORM_CHOICES = [
         ('linkedin', 'LinkedIn'),
@@ -724,17 +983,27 @@ class AccomplishmentShare(models.Model):
     ]
 
     accomplishment = models.ForeignKey(Accomplishment, on_delete=models.CASCADE)
+    # Copied from the accomplishment so a user's shares are listed without a join
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, editable=False, related_name='+')
     platform = models.CharField(max_length=20, choices=PLATFORM_CHOICES)
     shared_at = models.DateTimeField(auto_now_add=True)
     message = models.TextField(blank=True)
     is_successful = models.BooleanField(default=True)
 
     class Meta:
-        ordering = ['-shared_at']
+        ordering = ['-shared_at', '-id']
+        indexes = [
+            models.Index(fields=['user', '-shared_at', '-id'], name='share_user_shared_idx'),
+        ]
 
     def __str__(self):
         return f"{self.accomplishment.title} shared on {self.platform}"
 
+    def save(self, *args, **kwargs):
+        if self.user_id is None:
+            self.user_id = self.accomplishment.user_id
+        super().save(*args, **kwargs)
+
 class UserJob(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='user_jobs')
     title = models.CharField(max_length=255)
@@ -745,16 +1014,88 @@ class UserJob(models.Model):
     description = models.TextField(blank=True)
     created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created'], name='userjob_user_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 class Conversation(models.Model):
     participants = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='conversations')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized so the inbox can be listed without a per-row message lookup
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     def __str__(self):
         return f"Conversation {self.id}"
 
+    @property
+    def last_activity_at(self):
+        return self.last_message_at or self.created_at
+
+    def add_read_states(self, user_ids):
+        """Make sure every given participant has a read state, which is what lists the conversation in their inbox"""
+        ConversationReadState.objects.bulk_create(
+            [
+                ConversationReadState(conversation=self, user_id=user_id, last_activity_at=self.last_activity_at)
+                for user_id in user_ids
+            ],
+            ignore_conflicts=True
+        )
+
+    def record_message(self, message):
+        """Point the conversation at a new message and bump every other participant's unread count"""
+        participant_ids = list(self.participants.values_list('id', flat=True))
+        recipient_ids = [user_id for user_id in participant_ids if user_id != message.sender_id]
+        with transaction.atomic():
+            self.add_read_states(participant_ids)
+            ConversationReadState.objects.filter(
+                conversation=self, user_id__in=recipient_ids
+            ).update(unread_count=models.F('unread_count') + 1)
+            ConversationReadState.objects.filter(conversation=self).update(last_activity_at=message.created_at)
+            Conversation.objects.filter(pk=self.pk).update(
+                last_message=message, last_message_at=message.created_at
+            )
+        self.last_message = message
+        self.last_message_at = message.created_at
+
+    def mark_read(self, user):
+        """Mark every message from the other participants as read for this user"""
+        read_at = timezone.now()
+        with transaction.atomic():
+            self.messages.filter(is_read=False).exclude(sender=user).update(is_read=True)
+            ConversationReadState.objects.update_or_create(
+                conversation=self, user=user,
+                defaults={'unread_count': 0, 'last_read_at': read_at},
+                create_defaults={'unread_count': 0, 'last_read_at': read_at, 'last_activity_at': self.last_activity_at}
+            )
+        return read_at
+
+    def delete_message(self, message):
+        """Delete a message and undo record_message: drop it from unread counts and the last message pointer"""
+        message_id = message.id
+        with transaction.atomic():
+            message.delete()
+            if not message.is_read:
+                ConversationReadState.objects.filter(
+                    conversation=self, unread_count__gt=0
+                ).exclude(user_id=message.sender_id).update(unread_count=models.F('unread_count') - 1)
+            if self.last_message_id == message_id:
+                self.refresh_last_message()
+
+    def refresh_last_message(self):
+        """Recompute the last message pointer, e.g. after a message was deleted"""
+        last = self.messages.order_by('-created_at', '-id').first()
+        self.last_message = last
+        self.last_message_at = last.created_at if last else None
+        Conversation.objects.filter(pk=self.pk).update(
+            last_message=last, last_message_at=self.last_message_at
+        )
+        ConversationReadState.objects.filter(conversation=self).update(last_activity_at=self.last_activity_at)
+
 class Message(models.Model):
     conversation = models.ForeignKey(Conversation, related_name='messages', on_delete=models.CASCADE)
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='sent_messages', on_delete=models.CASCADE)
@@ -762,5 +1103,157 @@ class Message(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['conversation', 'created_at', 'id'], name='message_conv_created_idx'),
+        ]
+
     def __str__(self):
-        return f"Message {self.id} in {self.conversation.id}"
\ No newline at end of file
+        return f"Message {self.id} in {self.conversation.id}"
+
+class ConversationReadState(models.Model):
+    conversation = models.ForeignKey(Conversation, related_name='read_states', on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='conversation_read_states', on_delete=models.CASCADE)
+    unread_count = models.PositiveIntegerField(default=0)
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    # The conversation's last_activity_at, copied per participant so the inbox is read in index order
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['conversation', 'user']
+        indexes = [
+            models.Index(fields=['user', '-last_activity_at', '-conversation'], name='readstate_user_activity_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} in conversation {self.conversation_id}: {self.unread_count} unread"
+
+class TagIndexEntry(models.Model):
+    """
+    One row per (object, tag) for the JSON tag lists on Accomplishment and Note,
+    so tag lookups are indexed joins instead of scans over JSON. Maintained on
+    save (see signals.py); deleting the object cascades to its rows.
+    """
+    KIND_CHOICES = [
+        ('tag', 'Tag'),
+        ('skill', 'Skill'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100)
+    accomplishment = models.ForeignKey(Accomplishment, on_delete=models.CASCADE, null=True, blank=True, related_name='tag_entries')
+    note = models.ForeignKey(Note, on_delete=models.CASCADE, null=True, blank=True, related_name='tag_entries')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'kind', 'value'], name='tagindex_user_kind_value_idx'),
+            models.Index(fields=['kind', 'value'], name='tagindex_kind_value_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.value}"
+
+    @staticmethod
+    def normalize(value):
+        return str(value).strip().lower()[:100]
+
+    @classmethod
+    def index_values(cls, values):
+        normalized = []
+        for value in values or []:
+            if isinstance(value, (str, int, float)):
+                value = cls.normalize(value)
+                if value and value not in normalized:
+                    normalized.append(value)
+        return normalized
+
+    @classmethod
+    def reindex(cls, instance):
+        """Replace the rows for one Accomplishment or Note"""
+        target = 'accomplishment' if isinstance(instance, Accomplishment) else 'note'
+        lists = [('tag', instance.tags)]
+        if target == 'accomplishment':
+            lists.append(('skill', instance.skills_used))
+
+        with transaction.atomic():
+            cls.objects.filter(**{target: instance}).delete()
+            cls.objects.bulk_create([
+                cls(user_id=instance.user_id, kind=kind, value=value, **{target: instance})
+                for kind, values in lists
+                for value in cls.index_values(values)
+            ])
+
+class SearchDocument(models.Model):
+    """
+    Flattened, per-user text of the searchable objects (notes, work items,
+    accomplishments and jobs), kept current by signals. The full-text index on
+    top of it is backend specific; see search.py and migration 0023. On SQLite,
+    a migration that alters this table rebuilds it and drops the FTS triggers,
+    so it has to recreate them.
+    """
+    DOC_TYPES = [
+        ('note', 'Note'),
+        ('work_item', 'Work Item'),
+        ('accomplishment', 'Accomplishment'),
+        ('job', 'Job'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='search_documents')
+    doc_type = models.CharField(max_length=20, choices=DOC_TYPES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['doc_type', 'object_id']
+        indexes = [
+            models.Index(fields=['user', 'doc_type'], name='searchdoc_user_type_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.doc_type} {self.object_id}: {self.title}"
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload in progress. Chunks are written to a file under
+    CHUNKED_UPLOAD_DIR; on completion it becomes a DocumentUpload or a
+    VideoLecture built from `metadata`. See uploads.py.
+    """
+    TARGETS = [
+        ('document', 'Document'),
+        ('lecture_video', 'Lecture Video'),
+    ]
+    # 'receiving' and 'completing' are held by one request at a time, see uploads.claim_upload
+    STATUSES = [
+        ('uploading', 'Uploading'),
+        ('receiving', 'Receiving a chunk'),
+        ('completing', 'Completing'),
+        ('complete', 'Complete'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chunked_uploads')
+    target = models.CharField(max_length=20, choices=TARGETS)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # Bytes received so far; the next chunk must start here
+    offset = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True, help_text='Optional SHA-256 of the whole file, checked on completion')
+    metadata = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUSES, default='uploading')
+    result_id = models.PositiveBigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='chunkedupload_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def temp_path(self):
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f'{self.pk}.part')
@@ -0,0 +1,134 @@
+import base64
+import re
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+class MessageCursorPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id) for message history.
+
+    Without a cursor the newest page is returned. `?before=<cursor>` walks back
+    into older history and `?after=<cursor>` fetches anything newer than the
+    last message the client has seen. Each page is a single index range scan
+    on (conversation, created_at, id), so its cost does not depend on how long
+    the conversation is. Results are always returned oldest first.
+    """
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    before_query_param = 'before'
+    after_query_param = 'after'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        before = self.decode_cursor(request.query_params.get(self.before_query_param))
+        after = self.decode_cursor(request.query_params.get(self.after_query_param))
+
+        if after is not None:
+            created_at, pk = after
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            ).order_by('created_at', 'id')
+            rows = list(queryset[:page_size + 1])
+            self.has_older = True
+            self.has_newer = len(rows) > page_size
+            rows = rows[:page_size]
+        else:
+            if before is not None:
+                created_at, pk = before
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+            queryset = queryset.order_by('-created_at', '-id')
+            rows = list(queryset[:page_size + 1])
+            self.has_older = len(rows) > page_size
+            self.has_newer = before is not None
+            rows = rows[:page_size]
+            rows.reverse()
+
+        self.page = rows
+        self.request_after = request.query_params.get(self.after_query_param)
+        return rows
+
+    def get_paginated_response(self, data):
+        first = self.page[0] if self.page else None
+        last = self.page[-1] if self.page else None
+        return Response({
+            'before': self.encode_cursor(first) if first and self.has_older else None,
+            'after': self.encode_cursor(last) if last else self.request_after,
+            'has_older': self.has_older,
+            'has_newer': self.has_newer,
+            'results': data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, message):
+        raw = f"{message.created_at.isoformat()}|{message.id}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            created_at, pk = raw.rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class PublicFeedPagination(CursorPagination):
+    """Newest-first cursor pagination for the public accomplishment feed"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-date', '-created_at', '-pk')
+
+
+class StandardPagination(PageNumberPagination):
+    """Page-number pagination sized by REST_FRAMEWORK['PAGE_SIZE'], overridable with ?page_size="""
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Pages need a stable order; fall back to the primary key for unordered querysets
+        if not getattr(queryset, 'ordered', True):
+            queryset = queryset.order_by('pk')
+        return super().paginate_queryset(queryset, request, view)
+
+
+class CountlessCursorPagination(CursorPagination):
+    """
+    Cursor pagination for large per-user tables (time entries, mood entries).
+
+    Skips the COUNT(*) that page-number pagination runs on every request and
+    pages by the view queryset's own ordering, so each page is an index range
+    scan that stays stable while new rows are added.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    # Used when the queryset's ordering can't be turned into a cursor
+    ordering = '-pk'
+    # Cursor positions are read off the model instance, so only its own fields qualify
+    plain_field_re = re.compile(r'-?[A-Za-z][A-Za-z0-9]*(?:_[A-Za-z0-9]+)*')
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(queryset.query.order_by)
+        if ordering and all(isinstance(field, str) and self.plain_field_re.fullmatch(field) for field in ordering):
+            return ordering
+        return super().get_ordering(request, queryset, view)
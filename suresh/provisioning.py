@@ -0,0 +1,49 @@
+from django.db import transaction
+
+from .models import GlobalInformation, PersonalInformation, ProfessionalInformation, UserSettings
+
+
+def _personal_information(user):
+    return PersonalInformation(
+        user=user,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        preferred_full_name=f"{user.first_name} {user.last_name}".strip()
+    )
+
+# Per-user singleton rows every account is expected to have, with how to build each one
+PROVISIONED_MODELS = (
+    (PersonalInformation, _personal_information),
+    (GlobalInformation, lambda user: GlobalInformation(user=user)),
+    (ProfessionalInformation, lambda user: ProfessionalInformation(user=user)),
+    (UserSettings, lambda user: UserSettings(user=user)),
+)
+
+
+def provision_users(users):
+    """Create any missing singleton rows for the given users: one transaction, one insert per model"""
+    users = list(users)
+    if not users:
+        return
+    with transaction.atomic():
+        for model, build in PROVISIONED_MODELS:
+            model.objects.bulk_create([build(user) for user in users], ignore_conflicts=True)
+
+
+def provision_user(user):
+    provision_users([user])
+
+
+def get_provisioned(model, user):
+    """
+    Plain indexed lookup of a user's singleton row.
+
+    Accounts created outside RegisterView (admin, createsuperuser) may not have
+    been provisioned yet; they are provisioned on first access instead.
+    """
+    try:
+        return model.objects.get(user=user)
+    except model.DoesNotExist:
+        provision_user(user)
+        return model.objects.get(user=user)
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import re
+import threading
+from abc import ABC, abstractmethod
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+logger = logging.getLogger(__name__)
+
+CONVERSATION_PATH = re.compile(r'^/ws/conversations/(?P<pk>\d+)/?$')
+
+CLOSE_NOT_FOUND = 4404
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_INTERNAL_ERROR = 1011
+
+
+def conversation_group(conversation_id):
+    return f"conversation.{conversation_id}"
+
+
+class BaseBroadcast(ABC):
+    """
+    Fan-out layer between the API (which publishes) and open WebSockets (which subscribe).
+
+    `subscribe`/`unsubscribe` are called from the event loop serving the socket.
+    `publish` may be called from any thread, including sync Django views.
+    """
+
+    @abstractmethod
+    def subscribe(self, group):
+        """Return an asyncio.Queue that receives every payload published to `group`"""
+
+    @abstractmethod
+    def unsubscribe(self, group, queue):
+        pass
+
+    @abstractmethod
+    def publish(self, group, payload):
+        pass
+
+
+class InMemoryBroadcast(BaseBroadcast):
+    """Single-process broadcast; every worker only reaches the sockets it holds itself"""
+
+    def __init__(self):
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, group):
+        queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._groups.setdefault(group, set()).add((loop, queue))
+        return queue
+
+    def unsubscribe(self, group, queue):
+        with self._lock:
+            subscribers = self._groups.get(group, set())
+            for subscriber in [s for s in subscribers if s[1] is queue]:
+                subscribers.discard(subscriber)
+            if not subscribers:
+                self._groups.pop(group, None)
+
+    def publish(self, group, payload):
+        with self._lock:
+            subscribers = list(self._groups.get(group, ()))
+        for loop, queue in subscribers:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(queue.put_nowait, payload)
+
+
+_broadcast = None
+_broadcast_lock = threading.Lock()
+
+
+def get_broadcast():
+    global _broadcast
+    if _broadcast is None:
+        with _broadcast_lock:
+            if _broadcast is None:
+                backend = getattr(settings, 'REALTIME_BROADCAST_BACKEND', 'suresh.realtime.InMemoryBroadcast')
+                _broadcast = import_string(backend)()
+    return _broadcast
+
+
+def publish_message(message):
+    """Push a newly created message to everyone watching its conversation"""
+    from .serializers import MessageSerializer
+
+    get_broadcast().publish(conversation_group(message.conversation_id), {
+        'type': 'message',
+        'message': MessageSerializer(message).data,
+    })
+
+
+def publish_read_receipt(conversation, user, read_at):
+    get_broadcast().publish(conversation_group(conversation.id), {
+        'type': 'read',
+        'conversation': conversation.id,
+        'user': user.id,
+        'read_at': read_at,
+    })
+
+
+def _authenticate(scope):
+    close_old_connections()
+    try:
+        token = parse_qs(scope.get('query_string', b'').decode()).get('token', [None])[0]
+        if not token:
+            return None
+        auth = JWTAuthentication()
+        return auth.get_user(auth.get_validated_token(token))
+    except (InvalidToken, AuthenticationFailed, TokenError):
+        return None
+    finally:
+        close_old_connections()
+
+
+def _is_participant(conversation_id, user):
+    from .models import Conversation
+
+    close_old_connections()
+    try:
+        return Conversation.objects.filter(pk=conversation_id, participants=user).exists()
+    finally:
+        close_old_connections()
+
+
+async def websocket_application(scope, receive, send):
+    """
+    ASGI app for /ws/conversations/<id>/?token=<access token>.
+
+    Pushes `{"type": "message", ...}` for new messages and `{"type": "read", ...}`
+    for read receipts in that conversation. Client frames are ignored.
+    """
+    event = await receive()
+    if event['type'] != 'websocket.connect':
+        return
+
+    match = CONVERSATION_PATH.match(scope['path'])
+    if not match:
+        await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+        return
+
+    user = await sync_to_async(_authenticate)(scope)
+    if user is None:
+        await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+        return
+
+    conversation_id = int(match.group('pk'))
+    if not await sync_to_async(_is_participant)(conversation_id, user):
+        await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+        return
+
+    await send({'type': 'websocket.accept'})
+
+    broadcast = get_broadcast()
+    group = conversation_group(conversation_id)
+    queue = broadcast.subscribe(group)
+
+    async def pump():
+        while True:
+            payload = await queue.get()
+            await send({'type': 'websocket.send', 'text': json.dumps(payload, cls=DjangoJSONEncoder)})
+
+    async def close_after_error():
+        try:
+            await send({'type': 'websocket.close', 'code': CLOSE_INTERNAL_ERROR})
+        except Exception:
+            # The connection is already gone; receive() reports the disconnect
+            pass
+
+    closing = []
+
+    def pump_finished(task):
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(
+            'Stopped pushing conversation %s to user %s', conversation_id, user.pk, exc_info=task.exception()
+        )
+        closing.append(asyncio.ensure_future(close_after_error()))
+
+    pump_task = asyncio.ensure_future(pump())
+    pump_task.add_done_callback(pump_finished)
+    try:
+        while True:
+            event = await receive()
+            if event['type'] == 'websocket.disconnect':
+                break
+    finally:
+        pump_task.cancel()
+        broadcast.unsubscribe(group, queue)
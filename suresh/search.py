@@ -0,0 +1,198 @@
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Accomplishment, Note, SearchDocument, UserJob, WorkItem
+
+FTS_TABLE = 'suresh_search_fts'
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _join(*parts):
+    return '\n'.join(str(part) for part in parts if part)
+
+
+def _join_list(values):
+    return ' '.join(str(value) for value in values or [] if isinstance(value, (str, int, float)))
+
+# doc_type -> (model, function building (title, body) from an instance)
+SOURCES = {
+    'note': (Note, lambda note: (note.title, _join(note.content, _join_list(note.tags)))),
+    'work_item': (WorkItem, lambda item: (item.title, _join(item.get_work_type_display(), item.description))),
+    'accomplishment': (Accomplishment, lambda accomplishment: (
+        accomplishment.title,
+        _join(
+            accomplishment.description,
+            accomplishment.impact,
+            _join_list(accomplishment.tags),
+            _join_list(accomplishment.skills_used),
+        ),
+    )),
+    'job': (UserJob, lambda job: (
+        job.title,
+        _join(job.company, job.location, job.category, job.contract_type, job.description),
+    )),
+}
+MODEL_DOC_TYPES = {model: doc_type for doc_type, (model, _) in SOURCES.items()}
+
+
+def build_document(doc_type, instance):
+    _, build = SOURCES[doc_type]
+    title, body = build(instance)
+    return SearchDocument(
+        user_id=instance.user_id, doc_type=doc_type, object_id=instance.pk,
+        title=(title or '')[:255], body=body or ''
+    )
+
+
+def index_instance(instance):
+    doc_type = MODEL_DOC_TYPES[type(instance)]
+    document = build_document(doc_type, instance)
+    SearchDocument.objects.update_or_create(
+        doc_type=doc_type, object_id=instance.pk,
+        defaults={'user_id': document.user_id, 'title': document.title, 'body': document.body}
+    )
+
+
+def remove_instance(instance):
+    SearchDocument.objects.filter(doc_type=MODEL_DOC_TYPES[type(instance)], object_id=instance.pk).delete()
+
+
+def fts5_available():
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone()[0] > 0
+
+
+def build_fts5_query(user_id, query, prefix=True):
+    """
+    Turn free text into a safe FTS5 expression: every word must match (last one
+    as a prefix, for search-as-you-type), restricted to the user's documents.
+    """
+    tokens = TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    if prefix:
+        terms[-1] += '*'
+    return f'owner : "u{user_id}" AND {{title body}} : ({" ".join(terms)})'
+
+
+def _search_sqlite(user, query, doc_types, limit):
+    expression = build_fts5_query(user.id, query)
+    if expression is None:
+        return []
+    matches = f"""
+        FROM {FTS_TABLE}
+        JOIN suresh_searchdocument d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s
+    """
+    match_params = [expression]
+    if doc_types:
+        matches += f" AND d.doc_type IN ({', '.join(['%s'] * len(doc_types))})"
+        match_params.extend(doc_types)
+
+    with connection.cursor() as cursor:
+        # bm25 has to score every match before sorting, which is what makes broad
+        # queries slow on large indexes. Rank only the newest SEARCH_RANK_WINDOW
+        # matches: the floor is found by walking the index in rowid order, which
+        # is cheap, and the rowid range is pushed down into FTS5.
+        window = getattr(settings, 'SEARCH_RANK_WINDOW', 2000)
+        if window:
+            cursor.execute(
+                f"SELECT {FTS_TABLE}.rowid {matches} ORDER BY {FTS_TABLE}.rowid DESC LIMIT 1 OFFSET %s",
+                [*match_params, window - 1]
+            )
+            floor = cursor.fetchone()
+            if floor:
+                matches += f" AND {FTS_TABLE}.rowid >= %s"
+                match_params.append(floor[0])
+
+        cursor.execute(f"""
+            SELECT d.doc_type, d.object_id, d.title,
+                   snippet({FTS_TABLE}, 2, %s, %s, '…', 16) AS snippet,
+                   bm25({FTS_TABLE}, 0.0, 10.0, 1.0) AS rank
+            {matches}
+            ORDER BY rank LIMIT %s
+        """, [SNIPPET_START, SNIPPET_END, *match_params, limit])
+        return [
+            # bm25 is "lower is better"; flip it so higher means more relevant everywhere
+            {'type': doc_type, 'id': object_id, 'title': title, 'snippet': snippet, 'rank': -rank}
+            for doc_type, object_id, title, snippet, rank in cursor.fetchall()
+        ]
+
+
+def _search_postgres(user, query, doc_types, limit):
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+
+    # Must match the expression index created by migration 0023
+    vector = SearchVector('title', weight='A', config='english') + SearchVector('body', weight='B', config='english')
+    search_query = SearchQuery(query, search_type='websearch', config='english')
+    queryset = SearchDocument.objects.filter(user=user).annotate(
+        search=vector, rank=SearchRank(vector, search_query)
+    ).filter(search=search_query)
+    if doc_types:
+        queryset = queryset.filter(doc_type__in=doc_types)
+    queryset = queryset.annotate(snippet=SearchHeadline(
+        'body', search_query, config='english', start_sel=SNIPPET_START, stop_sel=SNIPPET_END, max_words=32
+    )).order_by('-rank')[:limit]
+    return [
+        {'type': doc.doc_type, 'id': doc.object_id, 'title': doc.title, 'snippet': doc.snippet, 'rank': doc.rank}
+        for doc in queryset
+    ]
+
+
+def _search_fallback(user, query, doc_types, limit):
+    queryset = SearchDocument.objects.filter(user=user)
+    for token in TOKEN_RE.findall(query):
+        queryset = queryset.filter(Q(title__icontains=token) | Q(body__icontains=token))
+    if doc_types:
+        queryset = queryset.filter(doc_type__in=doc_types)
+    return [
+        {'type': doc.doc_type, 'id': doc.object_id, 'title': doc.title, 'snippet': doc.body[:200], 'rank': 0}
+        for doc in queryset.order_by('-updated_at')[:limit]
+    ]
+
+
+def search(user, query, doc_types=None, limit=20):
+    """Ranked search over one user's documents"""
+    if connection.vendor == 'postgresql':
+        return _search_postgres(user, query, doc_types, limit)
+    if fts5_available():
+        return _search_sqlite(user, query, doc_types, limit)
+    return _search_fallback(user, query, doc_types, limit)
+
+
+def rebuild(batch_size=1000):
+    """Recreate every SearchDocument from the source models; the FTS5 table follows through its triggers"""
+    with transaction.atomic():
+        if fts5_available():
+            # Also drops any index rows that drifted from their documents
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        SearchDocument.objects.all().delete()
+        for doc_type, (model, _) in SOURCES.items():
+            batch = []
+            for instance in model.objects.iterator(chunk_size=batch_size):
+                batch.append(build_document(doc_type, instance))
+                if len(batch) >= batch_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    batch = []
+            SearchDocument.objects.bulk_create(batch)
+
+        # The insert triggers indexed every document above
+        optimize()
+    return SearchDocument.objects.count()
+
+
+def optimize():
+    """Merge the FTS5 index segments left behind by many small inserts"""
+    if fts5_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
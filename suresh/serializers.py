@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
+from django.db import transaction
 from .models import (
     WorkExperience,
     PreviousExperience,
@@ -48,11 +49,16 @@ from .models import (
     AccomplishmentShare,
     UserJob,
     Conversation,
-    Message
+    Message,
+    ChunkedUpload
 )
 from django.contrib.auth.password_validation import validate_password
+from django.conf import settings
 from django.core.exceptions import ValidationError
 import json
+import re
+from .uploads import validate_metadata
+from .thumbnails import thumbnail_urls
 
 User = get_user_model()
 
@@ -132,11 +138,14 @@ class LoginSerializer(serializers.Serializer):
 
 # Personal Information serializer
 class PersonalInformationSerializer(serializers.ModelSerializer):
+    profile_picture_thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = PersonalInformation
         fields = [
             'id',
             'profile_picture',
+            'profile_picture_thumbnails',
             'first_name',
             'middle_name',
             'last_name',
@@ -155,6 +164,9 @@ class PersonalInformationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
+    def get_profile_picture_thumbnails(self, obj):
+        return thumbnail_urls(obj.profile_picture_hash, self.context.get('request'))
+
     def create(self, validated_data):
         user = self.context['request'].user
         return PersonalInformation.objects.create(user=user, **validated_data)
@@ -206,10 +218,54 @@ class GlobalInformationSerializer(serializers.ModelSerializer):
         return instance
 
 # Professional Information serializers
+class ProfileSectionListSerializer(serializers.ListSerializer):
+    """
+    Bulk writes for the profile section serializers.
+
+    Create is a single bulk_create. For update, pass a {pk: instance} mapping as
+    the instance; every item must carry the id of one of those rows, at most
+    once, and the changed fields are written with a single bulk_update.
+    """
+
+    def to_internal_value(self, data):
+        self._seen_ids = set()
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            try:
+                pk = int(data.get('id'))
+                self.child.instance = self.instance[pk]
+            except (AttributeError, KeyError, TypeError, ValueError):
+                raise serializers.ValidationError({'id': ['Not found.']})
+            if pk in self._seen_ids:
+                raise serializers.ValidationError({'id': ['Duplicate id.']})
+            self._seen_ids.add(pk)
+            self.child.initial_data = data
+            return {**super().run_child_validation(data), 'id': pk}
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+    def update(self, instances, validated_data):
+        updated, fields = [], set()
+        for attrs in validated_data:
+            instance = instances[attrs.pop('id')]
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            fields.update(attrs)
+            updated.append(instance)
+        if fields:
+            self.child.Meta.model.objects.bulk_update(updated, fields)
+        return updated
+
 class WorkExperienceSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkExperience
         fields = '__all__'
+        list_serializer_class = ProfileSectionListSerializer
 
 class PreviousExperienceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -222,46 +278,54 @@ class PreviousExperienceSerializer(serializers.ModelSerializer):
             'end_date',
             'job_responsibilities'
         )
+        list_serializer_class = ProfileSectionListSerializer
 
 class EducationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Education
         fields = '__all__'
+        list_serializer_class = ProfileSectionListSerializer
 
 class LanguageSkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = LanguageSkill
         fields = '__all__'
+        list_serializer_class = ProfileSectionListSerializer
 
 class CertificateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Certificate
         fields = '__all__'
+        list_serializer_class = ProfileSectionListSerializer
 
 class HonorsAwardsPublicationsSerializer(serializers.ModelSerializer):
     class Meta:
         model = HonorsAwardsPublications
         fields = '__all__'
+        list_serializer_class = ProfileSectionListSerializer
 
 class FunctionalSkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = FunctionalSkill
         fields = '__all__'
+        list_serializer_class = ProfileSectionListSerializer
 
 class TechnicalSkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = TechnicalSkill
         fields = '__all__'
+        list_serializer_class = ProfileSectionListSerializer
 
 class ProfessionalInformationSerializer(serializers.ModelSerializer):
-    work_experiences = WorkExperienceSerializer(many=True, read_only=True)
-    previous_experiences = PreviousExperienceSerializer(many=True, read_only=True)
-    educations = EducationSerializer(many=True, read_only=True)
-    language_skills = LanguageSkillSerializer(many=True, read_only=True)
-    certificates = CertificateSerializer(many=True, read_only=True)
-    honors_awards_publications = HonorsAwardsPublicationsSerializer(many=True, read_only=True)
-    functional_skills = FunctionalSkillSerializer(many=True, read_only=True)
-    technical_skills = TechnicalSkillSerializer(many=True, read_only=True)
+    # Sections are read from the FK side, which is what the section viewsets write
+    work_experiences = WorkExperienceSerializer(source='work_experiences_set', many=True, read_only=True)
+    previous_experiences = PreviousExperienceSerializer(source='previous_experience', many=True, read_only=True)
+    educations = EducationSerializer(source='educations_set', many=True, read_only=True)
+    language_skills = LanguageSkillSerializer(source='language_skills_set', many=True, read_only=True)
+    certificates = CertificateSerializer(source='certificates_set', many=True, read_only=True)
+    honors_awards_publications = HonorsAwardsPublicationsSerializer(source='honors_awards_set', many=True, read_only=True)
+    functional_skills = FunctionalSkillSerializer(source='functional_skills_set', many=True, read_only=True)
+    technical_skills = TechnicalSkillSerializer(source='technical_skills_set', many=True, read_only=True)
 
     class Meta:
         model = ProfessionalInformation
@@ -338,59 +402,76 @@ class SwotAnalysisSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'strengths', 'weaknesses', 'opportunities', 'threats']
         read_only_fields = ['user']
 
-    def _create_items(self, swot_analysis, items_data, model_class):
-        for item in items_data:
-            # Handle both string and dictionary formats
-            description = item if isinstance(item, str) else item.get('description', '')
-            model_class.objects.create(
-                swot_analysis=swot_analysis,
-                description=description
-            )
+    @staticmethod
+    def _parse_item(item):
+        # Handle both string and dictionary formats
+        if isinstance(item, str):
+            return None, item
+        try:
+            pk = int(item.get('id'))
+        except (TypeError, ValueError):
+            pk = None
+        return pk, item.get('description', '')
+
+    def _sync_items(self, swot_analysis, related_name, items_data, model_class):
+        """
+        Make one quadrant match items_data, touching only the rows that changed.
+
+        Items are matched to existing rows by id first, then by identical
+        description; matched rows keep their primary key. Unmatched items are
+        inserted and unmatched rows deleted.
+
+        Quadrants have no position column and are always read in creation (id)
+        order, so the order of items in the request is not stored: moving an
+        existing item within the list does not change where it is returned.
+        """
+        existing = {row.pk: row for row in getattr(swot_analysis, related_name).all()}
+        parsed = [self._parse_item(item) for item in items_data]
+        matches = [None] * len(parsed)
+
+        for index, (pk, description) in enumerate(parsed):
+            if pk in existing:
+                matches[index] = existing.pop(pk)
+
+        for index, (pk, description) in enumerate(parsed):
+            if matches[index] is None:
+                row = next((row for row in existing.values() if row.description == description), None)
+                if row is not None:
+                    matches[index] = existing.pop(row.pk)
+
+        to_create, to_update = [], []
+        for row, (pk, description) in zip(matches, parsed):
+            if row is None:
+                to_create.append(model_class(swot_analysis=swot_analysis, description=description))
+            elif row.description != description:
+                row.description = description
+                to_update.append(row)
+
+        if existing:
+            model_class.objects.filter(pk__in=list(existing)).delete()
+        if to_update:
+            model_class.objects.bulk_update(to_update, ['description'])
+        if to_create:
+            model_class.objects.bulk_create(to_create)
 
     def create(self, validated_data):
-        # Create SwotAnalysis instance
-        swot_analysis = SwotAnalysis.objects.create(user=self.context['request'].user)
-
-        # Get nested data from the request data
         request_data = self.context['request'].data
 
-        # Create components if provided
-        if 'strengths' in request_data:
-            self._create_items(swot_analysis, request_data['strengths'], Strength)
-
-        if 'weaknesses' in request_data:
-            self._create_items(swot_analysis, request_data['weaknesses'], Weakness)
-
-        if 'opportunities' in request_data:
-            self._create_items(swot_analysis, request_data['opportunities'], Opportunity)
-
-        if 'threats' in request_data:
-            self._create_items(swot_analysis, request_data['threats'], Threat)
-
-        return swot_analysis
+        # Components provided in the request go in after the defaults, in the same insert
+        return SwotAnalysis.objects.create_with_entries(self.context['request'].user, {
+            related_name: [self._parse_item(item)[1] for item in request_data[related_name]]
+            for related_name in SwotAnalysis.quadrant_models()
+            if related_name in request_data
+        })
 
     def update(self, instance, validated_data):
         request_data = self.context['request'].data
 
-        # Update strengths
-        if 'strengths' in request_data:
-            instance.strengths.all().delete()
-            self._create_items(instance, request_data['strengths'], Strength)
-
-        # Update weaknesses
-        if 'weaknesses' in request_data:
-            instance.weaknesses.all().delete()
-            self._create_items(instance, request_data['weaknesses'], Weakness)
-
-        # Update opportunities
-        if 'opportunities' in request_data:
-            instance.opportunities.all().delete()
-            self._create_items(instance, request_data['opportunities'], Opportunity)
-
-        # Update threats
-        if 'threats' in request_data:
-            instance.threats.all().delete()
-            self._create_items(instance, request_data['threats'], Threat)
+        # Only the quadrants present in the request are synced
+        with transaction.atomic():
+            for related_name, (model_class, _) in SwotAnalysis.quadrant_models().items():
+                if related_name in request_data:
+                    self._sync_items(instance, related_name, request_data[related_name], model_class)
 
         return instance
 
@@ -399,7 +480,8 @@ class MainGoalSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = MainGoal
-        fields = ['id', 'name', 'description', 'category', 'start_date', 'end_date', 'status', 'weightage', 'subgoals']
+        fields = ['id', 'user', 'name', 'description', 'category', 'start_date', 'end_date', 'status', 'weightage', 'progress', 'subgoals']
+        read_only_fields = ['user', 'progress']
 
 # SubGoal Serializer
 class SubGoalSerializer(serializers.ModelSerializer):
@@ -407,6 +489,24 @@ class SubGoalSerializer(serializers.ModelSerializer):
         model = SubGoal
         fields = ['id', 'main_goal', 'name', 'description', 'start_date', 'end_date', 'status', 'required_effort', 'spent_effort', 'coach', 'accomplishment']
 
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is not None:
+            # Subgoals can only be attached to the requesting user's own goals
+            fields['main_goal'].queryset = MainGoal.objects.filter(user=request.user)
+        return fields
+
+class GoalTreeSubGoalSerializer(SubGoalSerializer):
+    # Annotated by MainGoalViewSet.tree
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta(SubGoalSerializer.Meta):
+        fields = SubGoalSerializer.Meta.fields + ['progress']
+
+class GoalTreeSerializer(MainGoalSerializer):
+    subgoals = GoalTreeSubGoalSerializer(many=True, read_only=True)
+
 # First define QuizSerializer since it's used by VideoLectureSerializer
 class QuizSerializer(serializers.ModelSerializer):
     class Meta:
@@ -420,6 +520,8 @@ class VideoLectureSerializer(serializers.ModelSerializer):
     class Meta:
         model = VideoLecture
         fields = ['id', 'course', 'title', 'video_file', 'description', 'quizzes']
+        # Uploaded by staff; viewers get a signed URL from the stream-url action
+        extra_kwargs = {'video_file': {'write_only': True}}
 
     def create(self, validated_data):
         quizzes_data = validated_data.pop('quizzes', [])
@@ -456,11 +558,20 @@ class CourseSerializer(serializers.ModelSerializer):
         return float(obj.final_price)
 
     def get_is_purchased(self, obj):
+        # CourseViewSet annotates this; look it up directly for anything else
+        if hasattr(obj, 'is_purchased'):
+            return obj.is_purchased
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.purchasers.filter(id=request.user.id).exists()
         return False
 
+class CourseCatalogSerializer(CourseSerializer):
+    """Course list entry without the nested lectures and quizzes"""
+
+    class Meta(CourseSerializer.Meta):
+        fields = [field for field in CourseSerializer.Meta.fields if field != 'course_lectures']
+
 class HabitSerializer(serializers.ModelSerializer):
     class Meta:
         model = Habit
@@ -537,18 +648,25 @@ class SurveyResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = SurveyResponse
         fields = '__all__'
+        read_only_fields = ['user']
 
 # Reward Serializer
 class RewardSerializer(serializers.ModelSerializer):
+    image_thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = Reward
-        fields = '__all__'
+        exclude = ['image_hash']
+
+    def get_image_thumbnails(self, obj):
+        return thumbnail_urls(obj.image_hash, self.context.get('request'))
 
 # User Reward Serializer
 class UserRewardSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserReward
         fields = '__all__'
+        read_only_fields = ['user']
 
 # Time Entry Serializer
 class TimeEntrySerializer(serializers.ModelSerializer):
@@ -579,6 +697,7 @@ class UserAssessmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserAssessment
         fields = '__all__'
+        read_only_fields = ['user']
 
 # Resume Serializer
 class ResumeSerializer(serializers.ModelSerializer):
@@ -650,14 +769,14 @@ class CoachSerializer(serializers.ModelSerializer):
             pass
 
         try:
-            prof_info = ProfessionalInformation.objects.get(user=user)
-            coach.work_experiences.set(prof_info.work_experiences.all())
-            coach.educations.set(prof_info.educations.all())
-            coach.language_skills.set(prof_info.language_skills.all())
-            coach.certificates.set(prof_info.certificates.all())
-            coach.honors_awards.set(prof_info.honors_awards_publications.all())
-            coach.functional_skills.set(prof_info.functional_skills.all())
-            coach.technical_skills.set(prof_info.technical_skills.all())
+            prof_info = ProfessionalInformation.objects.with_sections().get(user=user)
+            coach.work_experiences.set(prof_info.work_experiences_set.all())
+            coach.educations.set(prof_info.educations_set.all())
+            coach.language_skills.set(prof_info.language_skills_set.all())
+            coach.certificates.set(prof_info.certificates_set.all())
+            coach.honors_awards.set(prof_info.honors_awards_set.all())
+            coach.functional_skills.set(prof_info.functional_skills_set.all())
+            coach.technical_skills.set(prof_info.technical_skills_set.all())
         except ProfessionalInformation.DoesNotExist:
             pass
 
@@ -742,6 +861,9 @@ class AccomplishmentSerializer(serializers.ModelSerializer):
         return None
 
     def get_shares_count(self, obj):
+        # AccomplishmentViewSet annotates this; count directly for anything else
+        if hasattr(obj, 'shares_count'):
+            return obj.shares_count
         return obj.accomplishmentshare_set.count()
 
     def validate(self, data):
@@ -791,12 +913,40 @@ class MessageSerializer(serializers.ModelSerializer):
 
 class ConversationSerializer(serializers.ModelSerializer):
     participants = UserSerializer(many=True, read_only=True)
-    last_message = serializers.SerializerMethodField()
+    last_message = MessageSerializer(read_only=True)
+    unread_count = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
         model = Conversation
-        fields = ['id', 'participants', 'created_at', 'last_message']
+        fields = ['id', 'participants', 'created_at', 'last_message', 'last_message_at', 'unread_count']
+        read_only_fields = ['last_message_at']
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChunkedUpload
+        fields = ['id', 'target', 'filename', 'size', 'offset', 'checksum', 'metadata', 'status', 'result_id', 'created_at', 'updated_at']
+        read_only_fields = ['offset', 'status', 'result_id', 'created_at', 'updated_at']
 
-    def get_last_message(self, obj):
-        last = obj.messages.order_by('-created_at').first()
-        return MessageSerializer(last).data if last else None
\ No newline at end of file
+    def validate_filename(self, value):
+        # Only the base name is kept; storage sanitizes it further when saving
+        value = value.replace('\\', '/').rsplit('/', 1)[-1]
+        if not value:
+            raise serializers.ValidationError('A file name is required.')
+        return value
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f'Must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.')
+        return value
+
+    def validate_checksum(self, value):
+        value = value.lower()
+        if value and not re.fullmatch(r'[0-9a-f]{64}', value):
+            raise serializers.ValidationError('Must be a hex SHA-256 digest.')
+        return value
+
+    def validate(self, data):
+        errors = validate_metadata(data['target'], data.get('metadata') or {}, self.context['request'].user)
+        if errors:
+            raise serializers.ValidationError({'metadata': errors})
+        return data
@@ -0,0 +1,184 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import search, thumbnails
+from .caching import invalidate_accomplishment_stats, invalidate_course_catalog
+from .models import (
+    Accomplishment,
+    Conversation,
+    ConversationReadState,
+    Course,
+    MainGoal,
+    Note,
+    Quiz,
+    SubGoal,
+    RecentPublicAccomplishment,
+    TagIndexEntry,
+    ProfessionalInformation,
+    WorkExperience,
+    PreviousExperience,
+    Education,
+    LanguageSkill,
+    Certificate,
+    HonorsAwardsPublications,
+    FunctionalSkill,
+    TechnicalSkill,
+    VideoLecture,
+)
+
+PROFESSIONAL_SECTION_MODELS = (
+    WorkExperience,
+    PreviousExperience,
+    Education,
+    LanguageSkill,
+    Certificate,
+    HonorsAwardsPublications,
+    FunctionalSkill,
+    TechnicalSkill,
+)
+
+
+def touch_professional_information(sender, instance, **kwargs):
+    # Keep the profile's updated_at current so the profile ETag changes with its sections
+    if instance.professional_info_id:
+        ProfessionalInformation.objects.filter(pk=instance.professional_info_id).update(updated_at=timezone.now())
+
+
+for section_model in PROFESSIONAL_SECTION_MODELS:
+    post_save.connect(touch_professional_information, sender=section_model, dispatch_uid=f'touch_profile_{section_model.__name__}_save')
+    post_delete.connect(touch_professional_information, sender=section_model, dispatch_uid=f'touch_profile_{section_model.__name__}_delete')
+
+
+@receiver([post_save, post_delete], sender=Accomplishment, dispatch_uid='invalidate_accomplishment_stats')
+def accomplishment_changed(sender, instance, **kwargs):
+    invalidate_accomplishment_stats(instance.user_id)
+
+
+@receiver(post_init, sender=Accomplishment, dispatch_uid='remember_accomplishment_public')
+def remember_public(sender, instance, **kwargs):
+    # None when the field was deferred, which counts as possibly public
+    instance._loaded_is_public = instance.__dict__.get('is_public')
+
+
+@receiver(post_save, sender=Accomplishment, dispatch_uid='refresh_public_feed')
+def refresh_public_feed(sender, instance, **kwargs):
+    # Deletes cascade to the feed table on their own; private rows that stay private never touch it
+    if settings.PUBLIC_FEED_WINDOW and (instance.is_public or instance._loaded_is_public is not False):
+        RecentPublicAccomplishment.refresh_for(instance, settings.PUBLIC_FEED_WINDOW)
+    instance._loaded_is_public = instance.is_public
+
+
+@receiver(post_delete, sender=Accomplishment, dispatch_uid='refill_public_feed')
+def refill_public_feed(sender, instance, **kwargs):
+    # The entry itself goes with the cascade; backfill the window from the next newest public row
+    if settings.PUBLIC_FEED_WINDOW and instance.is_public:
+        RecentPublicAccomplishment.sync(settings.PUBLIC_FEED_WINDOW)
+
+
+@receiver(post_save, sender=Accomplishment, dispatch_uid='reindex_accomplishment_tags')
+@receiver(post_save, sender=Note, dispatch_uid='reindex_note_tags')
+def reindex_tags(sender, instance, **kwargs):
+    TagIndexEntry.reindex(instance)
+
+
+def update_search_document(sender, instance, **kwargs):
+    search.index_instance(instance)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    search.remove_instance(instance)
+
+
+for searchable_model in search.MODEL_DOC_TYPES:
+    post_save.connect(update_search_document, sender=searchable_model, dispatch_uid=f'search_index_{searchable_model.__name__}_save')
+    post_delete.connect(delete_search_document, sender=searchable_model, dispatch_uid=f'search_index_{searchable_model.__name__}_delete')
+
+
+@receiver([post_save, post_delete], sender=Course, dispatch_uid='invalidate_catalog_course')
+@receiver([post_save, post_delete], sender=VideoLecture, dispatch_uid='invalidate_catalog_lecture')
+@receiver([post_save, post_delete], sender=Quiz, dispatch_uid='invalidate_catalog_quiz')
+def course_catalog_changed(sender, instance, **kwargs):
+    invalidate_course_catalog()
+
+
+@receiver(m2m_changed, sender=Conversation.participants.through, dispatch_uid='sync_conversation_read_states')
+def sync_conversation_read_states(sender, instance, action, reverse, pk_set, **kwargs):
+    # The inbox lists conversations through read states, so there is one per participant
+    if action == 'post_add':
+        if reverse:
+            for conversation in Conversation.objects.filter(pk__in=pk_set):
+                conversation.add_read_states([instance.pk])
+        else:
+            instance.add_read_states(pk_set)
+    elif action == 'post_remove':
+        lookup = {'user': instance, 'conversation_id__in': pk_set} if reverse \
+            else {'conversation': instance, 'user_id__in': pk_set}
+        ConversationReadState.objects.filter(**lookup).delete()
+    elif action == 'post_clear':
+        ConversationReadState.objects.filter(**{'user' if reverse else 'conversation': instance}).delete()
+
+
+@receiver(post_init, sender=SubGoal, dispatch_uid='remember_subgoal_main_goal')
+def remember_main_goal(sender, instance, **kwargs):
+    # So a subgoal moved to another goal also refreshes the goal it left
+    instance._loaded_main_goal_id = instance.main_goal_id
+
+
+@receiver([post_save, post_delete], sender=SubGoal, dispatch_uid='refresh_main_goal_progress')
+def refresh_main_goal_progress(sender, instance, **kwargs):
+    MainGoal.refresh_progress(*{instance.main_goal_id, instance._loaded_main_goal_id} - {None})
+    instance._loaded_main_goal_id = instance.main_goal_id
+
+
+def remember_image_name(sender, instance, **kwargs):
+    instance._loaded_image_name = thumbnails.loaded_image_name(instance)
+
+
+def image_changed(sender, instance, **kwargs):
+    field, hash_field = thumbnails.THUMBNAIL_FIELDS[sender]
+    name = getattr(instance, field).name or ''
+    if instance._loaded_image_name is not None and name != instance._loaded_image_name:
+        # The old thumbnails no longer match; serializers report None until the new ones exist
+        if getattr(instance, hash_field):
+            setattr(instance, hash_field, '')
+            sender.objects.filter(pk=instance.pk).update(**{hash_field: ''})
+        thumbnails.schedule(instance)
+    instance._loaded_image_name = name
+
+
+for image_model in thumbnails.THUMBNAIL_FIELDS:
+    post_init.connect(remember_image_name, sender=image_model, dispatch_uid=f'thumbnails_{image_model.__name__}_init')
+    post_save.connect(image_changed, sender=image_model, dispatch_uid=f'thumbnails_{image_model.__name__}_save')
+
+
+# PRAGMA can't take bound parameters, so only these names and values are ever formatted into SQL
+SQLITE_PRAGMA_CHOICES = {
+    'journal_mode': ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'),
+    'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+}
+SQLITE_INTEGER_PRAGMAS = ('busy_timeout', 'cache_size', 'mmap_size')
+
+
+def sqlite_pragma_value(name, value):
+    if name in SQLITE_INTEGER_PRAGMAS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            pass
+    elif str(value).upper() in SQLITE_PRAGMA_CHOICES.get(name, ()):
+        return str(value).upper()
+    raise ImproperlyConfigured(f'Unsupported SQLITE_PRAGMAS entry: {name} = {value!r}')
+
+
+@receiver(connection_created, dispatch_uid='configure_sqlite_connection')
+def configure_sqlite_connection(sender, connection, **kwargs):
+    # WAL, busy timeout etc. for the sqlite backend; see SQLITE_PRAGMAS in settings
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {sqlite_pragma_value(name, value)}')
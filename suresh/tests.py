@@ -1,3 +1,936 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import (
+    Accomplishment,
+    AccomplishmentShare,
+    ChunkedUpload,
+    Conversation,
+    ConversationReadState,
+    Course,
+    CustomUser,
+    DocumentUpload,
+    MainGoal,
+    Message,
+    MoodTracking,
+    Note,
+    PreviousExperience,
+    ProfessionalInformation,
+    RecentPublicAccomplishment,
+    Reward,
+    SubGoal,
+    SwotAnalysis,
+    VideoLecture,
+)
+from . import search, thumbnails
+from .media import serve_public_media
+from .pagination import CountlessCursorPagination
+from .signals import sqlite_pragma_value
+from .uploads import UploadClaimLost, claim_upload, complete_upload
+from .realtime import (
+    CLOSE_FORBIDDEN,
+    CLOSE_INTERNAL_ERROR,
+    CLOSE_UNAUTHORIZED,
+    InMemoryBroadcast,
+    conversation_group,
+    get_broadcast,
+    websocket_application,
+)
+
+
+class AccomplishmentListQueryCountTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_accomplishments(self, count, is_public=False):
+        for i in range(count):
+            accomplishment = Accomplishment.objects.create(
+                user=self.user, title=f'Accomplishment {i}', description='Done',
+                date=date.today(), is_public=is_public
+            )
+            AccomplishmentShare.objects.create(accomplishment=accomplishment, platform='linkedin')
+            AccomplishmentShare.objects.create(accomplishment=accomplishment, platform='email')
+
+    def assert_constant_queries(self, url, is_public=False, queries=1):
+        self.create_accomplishments(2, is_public)
+        with self.assertNumQueries(queries) as small:
+            self.client.get(url)
+        self.create_accomplishments(20, is_public)
+        with self.assertNumQueries(len(small.captured_queries)):
+            response = self.client.get(url)
+        return response
+
+    def test_list_query_count_is_constant(self):
+        # COUNT(*) for the page-number paginator plus the page itself
+        response = self.assert_constant_queries('/api/accomplishments/', queries=2)
+        self.assertEqual(response.data['count'], 22)
+        self.assertTrue(all(item['shares_count'] == 2 for item in response.data['results']))
+
+    def test_public_query_count_is_constant(self):
+        response = self.assert_constant_queries('/api/accomplishments/public/', is_public=True)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_by_category_query_count_is_constant(self):
+        response = self.assert_constant_queries('/api/accomplishments/by_category/?category=professional', queries=2)
+        self.assertEqual(response.data['count'], 22)
+        self.assertEqual(len(response.data['results']), 22)
+
+
+class MessageViewSetTests(TestCase):
+    def setUp(self):
+        self.sender = CustomUser.objects.create_user(email='sender@example.com', username='sender', password='pass')
+        self.recipient = CustomUser.objects.create_user(email='recipient@example.com', username='recipient', password='pass')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.sender, self.recipient)
+        self.client = APIClient()
+        self.client.force_authenticate(self.sender)
+
+    def test_conversation_filter_rejects_non_integer_ids(self):
+        response = self.client.get('/api/messages/?conversation=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_conversation_filter(self):
+        message = Message.objects.create(conversation=self.conversation, sender=self.sender, text='Hi')
+        response = self.client.get(f'/api/messages/?conversation={self.conversation.pk}')
+        self.assertEqual([item['id'] for item in response.data['results']], [message.pk])
+
+    def send(self, text):
+        message = Message.objects.create(conversation=self.conversation, sender=self.sender, text=text)
+        self.conversation.record_message(message)
+        return message
+
+    def unread_count(self):
+        return ConversationReadState.objects.get(conversation=self.conversation, user=self.recipient).unread_count
+
+    def test_deleting_an_unread_message_decrements_unread_count(self):
+        self.send('First')
+        second = self.send('Second')
+        self.assertEqual(self.unread_count(), 2)
+
+        response = self.client.delete(f'/api/messages/{second.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.unread_count(), 1)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message.text, 'First')
+
+    def test_deleting_a_read_message_keeps_unread_count(self):
+        first = self.send('First')
+        self.conversation.mark_read(self.recipient)
+        self.send('Second')
+
+        self.client.delete(f'/api/messages/{first.pk}/')
+        self.assertEqual(self.unread_count(), 1)
+
+    def test_inbox_lists_conversations_by_last_activity(self):
+        older = Conversation.objects.create()
+        older.participants.add(self.sender, self.recipient)
+        self.send('Hi')
+        newer = Conversation.objects.create()
+        newer.participants.add(self.sender)
+
+        self.client.force_authenticate(self.recipient)
+        response = self.client.get('/api/conversations/')
+        self.assertEqual(
+            [(item['id'], item['unread_count']) for item in response.data['results']],
+            [(self.conversation.pk, 1), (older.pk, 0)]
+        )
+
+        self.conversation.participants.remove(self.recipient)
+        response = self.client.get('/api/conversations/')
+        self.assertEqual([item['id'] for item in response.data['results']], [older.pk])
+
+    def test_list_query_audit_passes(self):
+        call_command('audit_list_queries', '--fail-on-issues', stdout=io.StringIO())
+
+
+class InMemoryBroadcastTests(TestCase):
+    @async_to_sync
+    async def test_publish_from_another_thread_reaches_subscribers(self):
+        broadcast = InMemoryBroadcast()
+        queue = broadcast.subscribe('group')
+        other = broadcast.subscribe('other')
+
+        thread = threading.Thread(target=broadcast.publish, args=('group', {'n': 1}))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(await asyncio.wait_for(queue.get(), 1), {'n': 1})
+        self.assertTrue(other.empty())
+
+    @async_to_sync
+    async def test_unsubscribe_stops_delivery(self):
+        broadcast = InMemoryBroadcast()
+        queue = broadcast.subscribe('group')
+        broadcast.unsubscribe('group', queue)
+        broadcast.publish('group', {'n': 1})
+        await asyncio.sleep(0)
+        self.assertTrue(queue.empty())
+        self.assertEqual(broadcast._groups, {})
+
+
+class ConversationSocketTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='member@example.com', username='member', password='pass')
+        self.outsider = CustomUser.objects.create_user(email='outsider@example.com', username='outsider', password='pass')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.user)
+
+    def communicator(self, user=None):
+        query_string = f'token={RefreshToken.for_user(user).access_token}' if user else ''
+        return ApplicationCommunicator(websocket_application, {
+            'type': 'websocket',
+            'path': f'/ws/conversations/{self.conversation.pk}/',
+            'query_string': query_string.encode(),
+        })
+
+    async def connect(self, communicator):
+        await communicator.send_input({'type': 'websocket.connect'})
+        return await communicator.receive_output(timeout=5)
+
+    @async_to_sync
+    async def test_rejects_missing_token(self):
+        communicator = self.communicator()
+        self.assertEqual(await self.connect(communicator), {'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+
+    @async_to_sync
+    async def test_rejects_non_participants(self):
+        communicator = self.communicator(self.outsider)
+        self.assertEqual(await self.connect(communicator), {'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+
+    @async_to_sync
+    async def test_pushes_published_events(self):
+        communicator = self.communicator(self.user)
+        self.assertEqual(await self.connect(communicator), {'type': 'websocket.accept'})
+
+        get_broadcast().publish(conversation_group(self.conversation.pk), {'type': 'read', 'user': self.user.pk})
+        frame = await communicator.receive_output(timeout=5)
+        self.assertEqual(frame['type'], 'websocket.send')
+        self.assertJSONEqual(frame['text'], {'type': 'read', 'user': self.user.pk})
+
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait(timeout=5)
+        self.assertNotIn(conversation_group(self.conversation.pk), get_broadcast()._groups)
+
+    @async_to_sync
+    async def test_closes_the_socket_when_pushing_fails(self):
+        communicator = self.communicator(self.user)
+        await self.connect(communicator)
+
+        # Not JSON serializable, so the pump task fails
+        with self.assertLogs('suresh.realtime', 'ERROR'):
+            get_broadcast().publish(conversation_group(self.conversation.pk), {'type': 'read', 'user': object()})
+            frame = await communicator.receive_output(timeout=5)
+        self.assertEqual(frame, {'type': 'websocket.close', 'code': CLOSE_INTERNAL_ERROR})
+
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': CLOSE_INTERNAL_ERROR})
+        await communicator.wait(timeout=5)
+
+
+class ProfessionalInformationCreateTests(TestCase):
+    def test_create_after_registration_returns_the_provisioned_row(self):
+        client = APIClient()
+        response = client.post('/api/register/', {
+            'email': 'new@example.com',
+            'password': 'S3cure-pass-phrase',
+            'confirm_password': 'S3cure-pass-phrase',
+            'first_name': 'New',
+            'last_name': 'User',
+        })
+        self.assertEqual(response.status_code, 201)
+        user = CustomUser.objects.get(email='new@example.com')
+        provisioned = ProfessionalInformation.objects.get(user=user)
+
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        for _ in range(2):
+            response = client.post('/api/professional-info/', {}, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['id'], provisioned.pk)
+        self.assertEqual(ProfessionalInformation.objects.filter(user=user).count(), 1)
+
+
+class ProfileSectionBulkTests(TestCase):
+    url = '/api/previous-experiences/bulk/'
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self, *titles):
+        response = self.client.post(self.url, [
+            {'title': title, 'start_date': '2020-01-01', 'job_responsibilities': 'Work'} for title in titles
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        return [item['id'] for item in response.data]
+
+    def titles(self):
+        return list(PreviousExperience.objects.order_by('pk').values_list('title', flat=True))
+
+    def test_bulk_create_patch_and_delete(self):
+        first, second = self.create('First', 'Second')
+        self.assertEqual(self.titles(), ['First', 'Second'])
+
+        response = self.client.patch(self.url, [{'id': first, 'title': 'Renamed'}], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(), ['Renamed', 'Second'])
+
+        response = self.client.delete(self.url, {'ids': [first, second]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'deleted': 2})
+        self.assertEqual(self.titles(), [])
+
+    def test_invalid_items_are_reported_per_item_and_nothing_is_written(self):
+        response = self.client.post(self.url, [
+            {'title': 'Valid', 'start_date': '2020-01-01', 'job_responsibilities': 'Work'},
+            {'title': 'Missing dates'},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertEqual(set(response.data['errors'][1]), {'start_date', 'job_responsibilities'})
+        self.assertEqual(self.titles(), [])
+
+    def test_patch_rejects_duplicate_ids(self):
+        first, second = self.create('First', 'Second')
+        response = self.client.patch(self.url, [
+            {'id': first, 'title': 'A'},
+            {'id': second, 'title': 'B'},
+            {'id': first, 'title': 'C'},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [{}, {}, {'id': ['Duplicate id.']}])
+        self.assertEqual(self.titles(), ['First', 'Second'])
+
+    def test_patch_and_delete_only_reach_own_rows(self):
+        other = CustomUser.objects.create_user(email='other@example.com', username='other', password='pass')
+        theirs = PreviousExperience.objects.create(
+            professional_info=ProfessionalInformation.objects.create(user=other),
+            title='Theirs', start_date=date(2020, 1, 1), job_responsibilities='Work'
+        )
+        response = self.client.patch(self.url, [{'id': theirs.pk, 'title': 'Mine'}], format='json')
+        self.assertEqual(response.data['errors'], [{'id': ['Not found.']}])
+        response = self.client.delete(f'{self.url}?ids={theirs.pk}')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.titles(), ['Theirs'])
+
+
+class FullProfileETagTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        ProfessionalInformation.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def etag(self):
+        response = self.client.get('/api/profile/')
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_matching_if_none_match_is_not_modified(self):
+        etag = self.etag()
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_section_writes_change_the_etag(self):
+        item = {'title': 'First', 'start_date': '2020-01-01', 'job_responsibilities': 'Work'}
+        etags = [self.etag()]
+
+        response = self.client.post('/api/previous-experiences/', item, format='json')
+        self.assertEqual(response.status_code, 201)
+        etags.append(self.etag())
+
+        # bulk_create and bulk_update send no post_save
+        response = self.client.post('/api/previous-experiences/bulk/', [item], format='json')
+        self.assertEqual(response.status_code, 201)
+        etags.append(self.etag())
+        response = self.client.patch('/api/previous-experiences/bulk/', [{'id': response.data[0]['id'], 'title': 'Renamed'}], format='json')
+        self.assertEqual(response.status_code, 200)
+        etags.append(self.etag())
+
+        self.assertEqual(len(set(etags)), len(etags))
+        response = self.client.get('/api/profile/', HTTP_IF_NONE_MATCH=etags[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], etags[-1])
+
+
+class SubGoalViewSetTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.other = CustomUser.objects.create_user(email='other@example.com', username='other', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_goal(self, user, start_date):
+        return MainGoal.objects.create(
+            user=user, name='Goal', category='career', start_date=start_date, end_date=start_date, status='active'
+        )
+
+    def create_subgoal(self, goal, start_date):
+        return SubGoal.objects.create(main_goal=goal, name='Step', start_date=start_date, end_date=start_date, status='active')
+
+    def test_cannot_attach_a_subgoal_to_another_users_goal(self):
+        goal = self.create_goal(self.other, date(2026, 1, 1))
+        response = self.client.post('/api/sub-goals/', {
+            'main_goal': goal.pk, 'name': 'Step', 'start_date': '2026-01-01', 'end_date': '2026-01-02', 'status': 'active',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('main_goal', response.data)
+        self.assertFalse(SubGoal.objects.exists())
+
+    def test_list_is_grouped_by_goal_then_start_date(self):
+        first, second = self.create_goal(self.user, date(2026, 1, 1)), self.create_goal(self.user, date(2026, 2, 1))
+        expected = [
+            self.create_subgoal(first, date(2026, 1, 5)).pk,
+            self.create_subgoal(first, date(2026, 3, 1)).pk,
+            self.create_subgoal(second, date(2026, 2, 1)).pk,
+        ]
+        expected.insert(0, self.create_subgoal(first, date(2026, 1, 1)).pk)
+        self.create_subgoal(self.create_goal(self.other, date(2026, 1, 1)), date(2026, 1, 1))
+        # Ownerless goals from before goals were scoped are not listed
+        self.create_subgoal(self.create_goal(None, date(2026, 1, 1)), date(2026, 1, 1))
+
+        response = self.client.get('/api/sub-goals/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([subgoal['id'] for subgoal in response.data['results']], expected)
+
+
+class MainGoalTreeTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_goal(self, user, start_date, weightage, *efforts):
+        goal = MainGoal.objects.create(
+            user=user, name='Goal', category='career', start_date=start_date, end_date=start_date,
+            status='active', weightage=weightage
+        )
+        for offset, (required, spent) in enumerate(efforts):
+            SubGoal.objects.create(
+                main_goal=goal, name='Step', start_date=start_date + timedelta(days=offset), end_date=start_date,
+                status='active', required_effort=required, spent_effort=spent
+            )
+        return goal
+
+    def test_tree_is_weighted_and_loaded_in_two_queries(self):
+        # Overspent effort counts as done, an unsized subgoal as not started
+        first = self.create_goal(self.user, date(2026, 1, 1), 2, (10, 5), (30, 40))
+        second = self.create_goal(self.user, date(2026, 2, 1), 1, (0, 3), (10, 2.5))
+        other = CustomUser.objects.create_user(email='other@example.com', username='other', password='pass')
+        self.create_goal(other, date(2026, 1, 1), 5, (10, 10))
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/main-goals/tree/')
+        self.assertEqual(response.status_code, 200)
+
+        goals = response.data['goals']
+        self.assertEqual([goal['id'] for goal in goals], [first.pk, second.pk])
+        self.assertEqual([goal['progress'] for goal in goals], [87.5, 25.0])
+        self.assertEqual([subgoal['progress'] for subgoal in goals[0]['subgoals']], [50.0, 100.0])
+        self.assertEqual([subgoal['progress'] for subgoal in goals[1]['subgoals']], [0.0, 25.0])
+        self.assertAlmostEqual(response.data['overall_progress'], (87.5 * 2 + 25.0) / 3)
+
+        # The cached rollup is kept current by the subgoal signals
+        response = self.client.get('/api/main-goals/tree/?rollup=cached')
+        self.assertEqual([goal['progress'] for goal in response.data['goals']], [87.5, 25.0])
+
+
+class CountlessCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='owner@example.com', username='owner', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_only_plain_field_orderings_are_used_as_cursors(self):
+        paginator = CountlessCursorPagination()
+        queryset = MoodTracking.objects.all()
+        self.assertEqual(paginator.get_ordering(None, queryset.order_by('-date', 'created_at'), None), ('-date', 'created_at'))
+        for ordering in (['?'], [F('date').desc()], ['user__email'], ['-date', '?']):
+            self.assertEqual(paginator.get_ordering(None, queryset.order_by(*ordering), None), ('-pk',))
+
+    def test_mood_history_is_paginated(self):
+        for day in range(1, 4):
+            MoodTracking.objects.create(
+                user=self.user, current_mood='Calm', energy_level=5, stress_level=5, date=date(2026, 1, day)
+            )
+        response = self.client.get('/api/mood-tracking/history/?page_size=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry['date'] for entry in response.data['results']], ['2026-01-03', '2026-01-02'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([entry['date'] for entry in response.data['results']], ['2026-01-01'])
+        self.assertIsNone(response.data['next'])
+
+
+class CourseCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.buyer = CustomUser.objects.create_user(email='buyer@example.com', username='buyer', password='pass')
+        self.browser = CustomUser.objects.create_user(email='browser@example.com', username='browser', password='pass')
+        self.bought, self.other = Course.objects.create(title='Bought', price=10), Course.objects.create(title='Other', price=20)
+        self.bought.purchasers.add(self.buyer)
+
+    def list_purchase_status(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/courses/')
+        self.assertEqual(response.status_code, 200)
+        return {course['id']: course['is_purchased'] for course in response.data['results']}
+
+    def test_purchase_status_is_per_user_on_the_shared_catalog(self):
+        self.assertEqual(self.list_purchase_status(self.buyer), {self.bought.pk: True, self.other.pk: False})
+        with self.assertNumQueries(1):
+            # Catalog page from the cache, plus one purchase status query
+            self.assertEqual(self.list_purchase_status(self.browser), {self.bought.pk: False, self.other.pk: False})
+
+
+class VideoLectureAccessTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='viewer@example.com', username='viewer', password='pass')
+        self.course = Course.objects.create(title='Course', price=10)
+        self.lecture = VideoLecture.objects.create(course=self.course, title='Intro', video_file='course_videos/intro.mp4')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_lectures_require_authentication(self):
+        self.assertEqual(APIClient().get('/api/video-lectures/').status_code, 401)
+
+    def test_only_staff_can_change_lectures(self):
+        response = self.client.patch(f'/api/video-lectures/{self.lecture.pk}/', {'title': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.patch(f'/api/video-lectures/{self.lecture.pk}/', {'title': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_video_file_is_not_exposed(self):
+        response = self.client.get(f'/api/video-lectures/{self.lecture.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('video_file', response.data)
+        response = self.client.get(f'/api/courses/{self.course.pk}/')
+        self.assertEqual([sorted(lecture) for lecture in response.data['course_lectures']], [['course', 'description', 'id', 'quizzes', 'title']])
+
+    def test_media_view_refuses_lecture_videos(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            for name in ('course_videos/intro.mp4', 'rewards/badge.png'):
+                os.makedirs(os.path.join(media_root, os.path.dirname(name)), exist_ok=True)
+                with open(os.path.join(media_root, name), 'wb') as f:
+                    f.write(b'data')
+            request = RequestFactory().get('/media/')
+            self.assertEqual(serve_public_media(request, 'rewards/badge.png').status_code, 200)
+            for path in ('course_videos/intro.mp4', 'rewards/../course_videos/intro.mp4', '/course_videos/intro.mp4'):
+                with self.assertRaises(Http404):
+                    serve_public_media(request, path)
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='uploader@example.com', username='uploader', password='pass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(
+            CHUNKED_UPLOAD_DIR=os.path.join(directory.name, 'parts'), MEDIA_ROOT=os.path.join(directory.name, 'media')
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def start(self, target='document', metadata=None, size=4):
+        response = self.client.post('/api/uploads/', {
+            'target': target, 'filename': 'file.bin', 'size': size, 'metadata': metadata or {'document_type': 'resume'},
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def put_chunk(self, pk, data=b'data', start=0):
+        return self.client.put(
+            f'/api/uploads/{pk}/chunk/', data, content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(data) - 1}/4',
+        )
+
+    def test_upload_is_completed_once(self):
+        pk = self.start()
+        self.assertEqual(self.put_chunk(pk).data['offset'], 4)
+        self.assertEqual(self.client.post(f'/api/uploads/{pk}/complete/').status_code, 201)
+        response = self.client.post(f'/api/uploads/{pk}/complete/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error'], 'Upload already completed')
+
+    def test_claimed_upload_rejects_other_requests(self):
+        pk = self.start()
+        ChunkedUpload.objects.filter(pk=pk).update(status='receiving')
+        response = self.put_chunk(pk)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error'], 'Another request is writing to this upload')
+
+        ChunkedUpload.objects.filter(pk=pk).update(status='completing', offset=4)
+        response = self.client.post(f'/api/uploads/{pk}/complete/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(ChunkedUpload.objects.get(pk=pk).status, 'completing')
+
+    def test_stale_chunk_claim_is_taken_over(self):
+        pk = self.start()
+        stale = timezone.now() - timedelta(seconds=settings.CHUNKED_UPLOAD_CLAIM_TIMEOUT + 1)
+        ChunkedUpload.objects.filter(pk=pk).update(status='receiving', updated_at=stale)
+        self.assertEqual(self.put_chunk(pk).status_code, 200)
+        self.assertEqual(ChunkedUpload.objects.filter(pk=pk).values_list('status', 'offset').get(), ('uploading', 4))
+
+    def test_stale_completion_is_taken_over(self):
+        pk = self.start()
+        self.put_chunk(pk)
+        stale = timezone.now() - timedelta(seconds=settings.CHUNKED_UPLOAD_CLAIM_TIMEOUT + 1)
+        ChunkedUpload.objects.filter(pk=pk).update(status='completing', updated_at=stale)
+        self.assertEqual(self.client.post(f'/api/uploads/{pk}/complete/').status_code, 201)
+        self.assertEqual(ChunkedUpload.objects.get(pk=pk).status, 'complete')
+
+    def test_stale_completion_without_the_assembled_file_restarts(self):
+        pk = self.start()
+        self.put_chunk(pk)
+        upload = ChunkedUpload.objects.get(pk=pk)
+        os.remove(upload.temp_path)
+        stale = timezone.now() - timedelta(seconds=settings.CHUNKED_UPLOAD_CLAIM_TIMEOUT + 1)
+        ChunkedUpload.objects.filter(pk=pk).update(status='completing', updated_at=stale)
+        response = self.client.post(f'/api/uploads/{pk}/complete/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 0)
+        self.assertEqual(ChunkedUpload.objects.filter(pk=pk).values_list('status', 'offset').get(), ('uploading', 0))
+        self.assertTrue(os.path.isfile(upload.temp_path))
+
+    def test_completion_fails_once_its_claim_is_taken_over(self):
+        pk = self.start()
+        self.put_chunk(pk)
+        upload = ChunkedUpload.objects.get(pk=pk)
+        claimed_at = claim_upload(upload, 'completing', offset=4)
+        # Another request's claim replaces this one
+        ChunkedUpload.objects.filter(pk=pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+        with self.assertRaises(UploadClaimLost):
+            complete_upload(upload, claimed_at)
+        self.assertFalse(DocumentUpload.objects.exists())
+        self.assertEqual(os.listdir(os.path.join(settings.MEDIA_ROOT, 'documents')), [])
+        self.assertEqual(ChunkedUpload.objects.get(pk=pk).status, 'completing')
+
+    def test_purge_removes_abandoned_claims(self):
+        idle = timezone.now() - timedelta(hours=49)
+        stuck, done = self.start(), self.start()
+        ChunkedUpload.objects.filter(pk=stuck).update(status='receiving', updated_at=idle)
+        ChunkedUpload.objects.filter(pk=done).update(status='complete', updated_at=idle)
+        temp_path = ChunkedUpload.objects.get(pk=stuck).temp_path
+        call_command('purge_chunked_uploads', stdout=io.StringIO())
+        self.assertEqual(list(ChunkedUpload.objects.values_list('pk', flat=True)), [done])
+        self.assertFalse(os.path.exists(temp_path))
+
+    def test_lecture_for_a_deleted_course_is_rejected(self):
+        course = Course.objects.create(title='Course', price=10)
+        pk = self.start('lecture_video', {'course': course.pk, 'title': 'Intro'})
+        self.put_chunk(pk)
+        course.delete()
+        response = self.client.post(f'/api/uploads/{pk}/complete/')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ChunkedUpload.objects.filter(pk=pk).exists())
+        self.assertFalse(VideoLecture.objects.exists())
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, THUMBNAIL_WORKERS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def png(self, color=(255, 0, 0, 128), size=(600, 400)):
+        output = io.BytesIO()
+        Image.new('RGBA', size, color).save(output, 'PNG')
+        return output.getvalue()
+
+    def create_reward(self, content):
+        return Reward.objects.create(
+            title='Badge', description='', points_required=1, type='badge',
+            image=SimpleUploadedFile('badge.png', content, 'image/png'),
+        )
+
+    def thumbnail_path(self, digest, size_name, fmt):
+        return os.path.join(self.media_root, thumbnails.thumbnail_name(digest, size_name, fmt))
+
+    def test_process_image_writes_every_size_and_format(self):
+        content = self.png()
+        reward = self.create_reward(content)
+        digest = thumbnails.process_image(Reward, reward.pk, reward.image.name)
+
+        self.assertEqual(digest, hashlib.sha256(content).hexdigest())
+        self.assertEqual(thumbnails.thumbnail_name(digest, 'small', 'webp'), f'thumbnails/{digest[:2]}/{digest}/small.webp')
+        self.assertEqual(Reward.objects.get(pk=reward.pk).image_hash, digest)
+        for size_name, pixels in thumbnails.get_sizes().items():
+            for fmt, pillow_format in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+                with Image.open(self.thumbnail_path(digest, size_name, fmt)) as image:
+                    self.assertEqual(image.format, pillow_format)
+                    self.assertEqual(max(image.size), pixels)
+
+    def test_existing_thumbnails_are_not_regenerated(self):
+        content = self.png()
+        first, second = self.create_reward(content), self.create_reward(content)
+        digest = thumbnails.process_image(Reward, first.pk, first.image.name)
+        path = self.thumbnail_path(digest, 'medium', 'jpeg')
+        os.utime(path, (0, 0))
+
+        # Same content under another name: the derivatives keyed by its hash are reused
+        self.assertEqual(thumbnails.process_image(Reward, second.pk, second.image.name), digest)
+        self.assertEqual(os.stat(path).st_mtime, 0)
+        self.assertEqual(Reward.objects.get(pk=second.pk).image_hash, digest)
+
+    def test_hash_is_not_recorded_when_the_image_changed_meanwhile(self):
+        reward = self.create_reward(self.png())
+        old_name = reward.image.name
+        Reward.objects.filter(pk=reward.pk).update(image='rewards/replaced.png')
+        self.assertIsNotNone(thumbnails.process_image(Reward, reward.pk, old_name))
+        self.assertEqual(Reward.objects.get(pk=reward.pk).image_hash, '')
+
+    def test_saving_a_new_image_schedules_processing(self):
+        reward = self.create_reward(self.png())
+        with self.captureOnCommitCallbacks(execute=True):
+            reward.image = SimpleUploadedFile('new.png', self.png((0, 0, 255, 255)), 'image/png')
+            reward.save()
+        self.assertEqual(len(Reward.objects.get(pk=reward.pk).image_hash), 64)
+
+    def test_generate_thumbnails_catches_up_on_dropped_jobs(self):
+        # Created without running the on-commit job, as after a restart dropped the queue
+        reward = self.create_reward(self.png())
+        self.assertEqual(Reward.objects.get(pk=reward.pk).image_hash, '')
+        call_command('generate_thumbnails', stdout=io.StringIO())
+        self.assertEqual(len(Reward.objects.get(pk=reward.pk).image_hash), 64)
+
+
+class SwotAnalysisTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='swot@example.com', username='swot', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_inserts_each_quadrant_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/swot/', {
+                'strengths': ['Focus', {'description': 'Stamina'}], 'threats': ['Burnout'],
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        inserts = [query['sql'] for query in queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 5)  # the analysis, then one per quadrant
+
+        analysis = SwotAnalysis.objects.get(pk=response.data['id'])
+        self.assertEqual(
+            list(analysis.strengths.order_by('id').values_list('description', flat=True)),
+            ['Default Strength', 'Focus', 'Stamina'],
+        )
+        self.assertEqual(list(analysis.threats.order_by('id').values_list('description', flat=True)), ['Default Threat', 'Burnout'])
+        self.assertEqual(list(analysis.weaknesses.values_list('description', flat=True)), ['Default Weakness'])
+
+    def test_plain_save_still_creates_the_defaults(self):
+        analysis = SwotAnalysis.objects.create(user=self.user)
+        self.assertEqual(list(analysis.opportunities.values_list('description', flat=True)), ['Default Opportunity'])
+
+    def quadrant(self, analysis, related_name):
+        return list(getattr(analysis, related_name).order_by('id').values_list('id', 'description'))
+
+    def test_update_keeps_the_ids_of_matched_items(self):
+        analysis = SwotAnalysis.objects.create_with_entries(self.user, {'strengths': ['Focus', 'Stamina']})
+        (default_id, _), (focus_id, _), (stamina_id, _) = self.quadrant(analysis, 'strengths')
+        weaknesses = self.quadrant(analysis, 'weaknesses')
+
+        response = self.client.patch(f'/api/swot/{analysis.pk}/', {
+            'strengths': [{'id': focus_id, 'description': 'Deep focus'}, 'Stamina', 'Grit'],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        strengths = self.quadrant(analysis, 'strengths')
+        self.assertEqual(strengths[:2], [(focus_id, 'Deep focus'), (stamina_id, 'Stamina')])
+        self.assertEqual(strengths[2][1], 'Grit')
+        self.assertNotIn(default_id, [pk for pk, _ in strengths])
+        # Quadrants missing from the request are left alone
+        self.assertEqual(self.quadrant(analysis, 'weaknesses'), weaknesses)
+
+    def test_board_query_count_does_not_grow_with_items(self):
+        SwotAnalysis.objects.create(user=self.user)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/swot/board/')
+        self.assertEqual(len(response.data['strengths']), 1)
+
+        latest = SwotAnalysis.objects.create_with_entries(self.user, {
+            related_name: [f'Item {n}' for n in range(5)] for related_name in SwotAnalysis.quadrant_models()
+        })
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/swot/board/')
+        self.assertEqual(response.data['id'], latest.pk)
+        for related_name in SwotAnalysis.quadrant_models():
+            self.assertEqual(
+                [item['id'] for item in response.data[related_name]],
+                [pk for pk, _ in self.quadrant(latest, related_name)],
+            )
+
+
+# Run in a separate process, where DATABASE_URL / DATABASE_REPLICA_URL point at two sqlite files
+REPLICA_ROUTING_SCRIPT = """
+import json
+import django
+django.setup()
+from django.test.utils import setup_test_environment
+from rest_framework.test import APIClient
+from suresh.models import CustomUser, Note
+
+setup_test_environment()
+user = CustomUser.objects.create_user(email='reader@example.com', username='reader', password='pass')
+user.save(using='replica', force_insert=True)
+Note.objects.using('replica').create(user=user, title='replica only', content='Only on the replica')
+
+client = APIClient()
+client.force_authenticate(user)
+listed = client.get('/api/notes/').data['results']
+created = client.post('/api/notes/', {'user': user.pk, 'title': 'written', 'content': 'New'}, format='json')
+print(json.dumps({
+    'listed': [note['title'] for note in listed],
+    'created': created.status_code,
+    'primary': sorted(Note.objects.using('default').values_list('title', flat=True)),
+    'replica': sorted(Note.objects.using('replica').values_list('title', flat=True)),
+}))
+"""
+
+
+class ReplicaRoutingTests(TestCase):
+    def test_reads_use_the_replica_and_writes_the_primary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Both files start as copies of the migrated test database
+            paths = {alias: os.path.join(directory, f'{alias}.sqlite3') for alias in ('primary', 'replica')}
+            connection.ensure_connection()
+            for path in paths.values():
+                target = sqlite3.connect(path)
+                connection.connection.backup(target)
+                target.close()
+
+            env = {
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': 'sureshproject.settings',
+                'DATABASE_URL': f"sqlite:///{paths['primary']}",
+                'DATABASE_REPLICA_URL': f"sqlite:///{paths['replica']}",
+            }
+            result = subprocess.run(
+                [sys.executable, '-c', REPLICA_ROUTING_SCRIPT],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=120,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        outcome = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(outcome['listed'], ['replica only'])
+        self.assertEqual(outcome['created'], 201)
+        self.assertEqual(outcome['primary'], ['written'])
+        self.assertEqual(outcome['replica'], ['replica only'])
+
+
+class SqlitePragmaTests(SimpleTestCase):
+    def test_known_values_are_normalized(self):
+        self.assertEqual(sqlite_pragma_value('journal_mode', 'wal'), 'WAL')
+        self.assertEqual(sqlite_pragma_value('busy_timeout', '5000'), 5000)
+
+    def test_anything_else_is_rejected(self):
+        for name, value in [('journal_mode', 'WAL; DROP TABLE suresh_note'), ('cache_size', '1; x'), ('temp_store', '2')]:
+            with self.assertRaises(ImproperlyConfigured):
+                sqlite_pragma_value(name, value)
+
+
+@override_settings(PUBLIC_FEED_WINDOW=2)
+class RecentPublicAccomplishmentTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='feed@example.com', username='feed', password='pass')
+        self.accomplishments = [
+            Accomplishment.objects.create(
+                user=self.user, title=f'Accomplishment {day}', description='Done',
+                date=date(2026, 1, day), is_public=True
+            )
+            for day in (1, 2, 3)
+        ]
+
+    def feed_titles(self):
+        return sorted(RecentPublicAccomplishment.objects.values_list('accomplishment__title', flat=True))
+
+    def test_window_keeps_the_newest(self):
+        self.assertEqual(self.feed_titles(), ['Accomplishment 2', 'Accomplishment 3'])
+
+    def test_making_an_entry_private_backfills_the_window(self):
+        newest = self.accomplishments[2]
+        newest.is_public = False
+        newest.save()
+        self.assertEqual(self.feed_titles(), ['Accomplishment 1', 'Accomplishment 2'])
+
+    def test_deleting_an_entry_backfills_the_window(self):
+        self.accomplishments[1].delete()
+        self.assertEqual(self.feed_titles(), ['Accomplishment 1', 'Accomplishment 3'])
+
+    def test_private_saves_leave_the_feed_alone(self):
+        private = Accomplishment.objects.create(
+            user=self.user, title='Private', description='Done', date=date(2026, 1, 9), is_public=False
+        )
+        private.title = 'Still private'
+        with CaptureQueriesContext(connection) as queries:
+            private.save()
+        self.assertFalse([query for query in queries if 'recentpublicaccomplishment' in query['sql']])
+
+        private = Accomplishment.objects.get(pk=private.pk)
+        private.is_public = True
+        private.save()
+        self.assertEqual(self.feed_titles(), ['Accomplishment 3', 'Still private'])
+
+    def test_sync_tolerates_entries_backfilled_concurrently(self):
+        # As if another save inserted the missing entries after this one listed what is present
+        with mock.patch.object(RecentPublicAccomplishment.objects, 'values_list', return_value=[]):
+            RecentPublicAccomplishment.sync(2)
+        self.assertEqual(self.feed_titles(), ['Accomplishment 2', 'Accomplishment 3'])
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='search@example.com', username='search', password='pass')
+        other = CustomUser.objects.create_user(email='other@example.com', username='other', password='pass')
+        Note.objects.create(user=other, title='Quarterly report', content='Not yours')
+        self.notes = [
+            Note.objects.create(user=self.user, title=f'Quarterly report {n}', content='Revenue grew') for n in range(3)
+        ]
+
+    def test_search_is_scoped_to_the_user(self):
+        results = search.search(self.user, 'quarterly')
+        self.assertEqual(sorted(result['id'] for result in results), [note.pk for note in self.notes])
+        self.assertTrue(all(result['type'] == 'note' for result in results))
+
+    @override_settings(SEARCH_RANK_WINDOW=2)
+    def test_broad_queries_rank_the_newest_matches(self):
+        if not search.fts5_available():
+            self.skipTest('sqlite without FTS5')
+        results = search.search(self.user, 'report')
+        self.assertEqual(sorted(result['id'] for result in results), [note.pk for note in self.notes[1:]])
@@ -0,0 +1,184 @@
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import PersonalInformation, Reward
+
+logger = logging.getLogger(__name__)
+
+# model -> (image field, field holding the content hash once thumbnails exist)
+THUMBNAIL_FIELDS = {
+    PersonalInformation: ('profile_picture', 'profile_picture_hash'),
+    Reward: ('image', 'image_hash'),
+}
+# format name -> (Pillow format, file extension)
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+HASH_BLOCK_SIZE = 64 * 1024
+
+
+def get_sizes():
+    return getattr(settings, 'THUMBNAIL_SIZES', {'small': 64, 'medium': 256, 'large': 512})
+
+
+def get_formats():
+    return [fmt for fmt in getattr(settings, 'THUMBNAIL_FORMATS', ('webp', 'jpeg')) if fmt in FORMATS]
+
+
+def thumbnail_name(digest, size_name, fmt):
+    # Keyed by content, so the same picture uploaded twice is only processed once
+    return f'thumbnails/{digest[:2]}/{digest}/{size_name}.{FORMATS[fmt][1]}'
+
+
+def thumbnail_urls(digest, request=None):
+    """{size: {format: url}} for a processed image, or None while it is still pending"""
+    if not digest:
+        return None
+    urls = {}
+    for size_name in get_sizes():
+        urls[size_name] = {}
+        for fmt in get_formats():
+            url = default_storage.url(thumbnail_name(digest, size_name, fmt))
+            urls[size_name][fmt] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+def loaded_image_name(instance):
+    """The stored file name without triggering a query for a deferred field; None if deferred"""
+    field, _ = THUMBNAIL_FIELDS[type(instance)]
+    if field not in instance.__dict__:
+        return None
+    value = instance.__dict__[field]
+    return getattr(value, 'name', value) or ''
+
+
+def _encode(image, fmt):
+    pillow_format, _ = FORMATS[fmt]
+    if pillow_format == 'JPEG' and image.mode != 'RGB':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            # JPEG has no alpha: flatten transparent areas onto white rather than black
+            rgba = image.convert('RGBA')
+            background = Image.new('RGB', rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            image = background
+        else:
+            image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+    output = io.BytesIO()
+    quality = getattr(settings, 'THUMBNAIL_QUALITY', 82)
+    if pillow_format == 'JPEG':
+        image.save(output, pillow_format, quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(output, pillow_format, quality=quality, method=4)
+    return output.getvalue()
+
+
+def generate_thumbnails(name, storage=default_storage):
+    """
+    Create every configured size and format for the stored image `name` and
+    return its content hash. Derivatives that already exist are left alone, so
+    a picture shared by several rows (or reprocessed) is decoded at most once.
+    """
+    digest = hashlib.sha256()
+    with storage.open(name, 'rb') as source:
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+        digest = digest.hexdigest()
+
+        missing = [
+            (size_name, pixels, fmt)
+            for size_name, pixels in get_sizes().items()
+            for fmt in get_formats()
+            if not storage.exists(thumbnail_name(digest, size_name, fmt))
+        ]
+        if not missing:
+            return digest
+
+        source.seek(0)
+        image = Image.open(source)
+        largest = max(pixels for _, pixels, _ in missing)
+        # Lets the JPEG decoder downscale by 1/2..1/8 while decoding instead of after
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    # Largest first, each size resampled from the previous one
+    for pixels in sorted({pixels for _, pixels, _ in missing}, reverse=True):
+        image.thumbnail((pixels, pixels), Image.LANCZOS)
+        for size_name, size_pixels, fmt in missing:
+            if size_pixels == pixels:
+                storage.save(thumbnail_name(digest, size_name, fmt), ContentFile(_encode(image, fmt)))
+    return digest
+
+
+def process_image(model, pk, name):
+    """Generate thumbnails for one row's image and record its hash if the image hasn't changed since"""
+    field, hash_field = THUMBNAIL_FIELDS[model]
+    try:
+        digest = generate_thumbnails(name)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.exception('Could not generate thumbnails for %s %s (%s)', model.__name__, pk, name)
+        return None
+    updates = {hash_field: digest}
+    if any(f.name == 'updated_at' for f in model._meta.concrete_fields):
+        # Changes the profile ETag so clients pick up the thumbnail URLs
+        updates['updated_at'] = timezone.now()
+    model.objects.filter(pk=pk, **{field: name}).update(**updates)
+    return digest
+
+
+def _run_in_worker(job):
+    # Worker threads hold their own DB connections; keep them from going stale
+    close_old_connections()
+    try:
+        job()
+    except Exception:
+        logger.exception('Thumbnail job failed')
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.THUMBNAIL_WORKERS, thread_name_prefix='thumbnails'
+                )
+    return _executor
+
+
+def schedule(instance):
+    """
+    Process the instance's image once the current transaction commits, off the
+    request thread. The queue is in memory: jobs still waiting when the process
+    exits are dropped and their rows keep an empty hash, which is what
+    `manage.py generate_thumbnails` looks for, so that command is the recovery path.
+    """
+    field, _ = THUMBNAIL_FIELDS[type(instance)]
+    name = getattr(instance, field).name
+    if not name:
+        return
+    job = partial(process_image, type(instance), instance.pk, name)
+    if getattr(settings, 'THUMBNAIL_WORKERS', 2) <= 0:
+        transaction.on_commit(job)
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_run_in_worker, job))
@@ -0,0 +1,197 @@
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import FileField, Q
+from django.utils import timezone
+
+from .models import ChunkedUpload, Course, DocumentUpload, VideoLecture
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class AssembledFile(File):
+    """
+    The finished upload. Exposing temporary_file_path() lets FileSystemStorage
+    move it into place instead of copying it.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+class UploadTargetGone(Exception):
+    """The object the upload was going to be attached to (a lecture's course) was deleted"""
+
+
+class UploadClaimLost(Exception):
+    """Another request took over the upload's claim (see claim_upload) before it completed"""
+
+
+def validate_metadata(target, metadata, user):
+    """Check the fields needed to build the target object up front, before any bytes are sent"""
+    errors = {}
+    if target == 'document':
+        document_types = dict(DocumentUpload.DOCUMENT_TYPES)
+        if metadata.get('document_type') not in document_types:
+            errors['document_type'] = [f"Must be one of: {', '.join(document_types)}"]
+    elif target == 'lecture_video':
+        course = Course.objects.filter(pk=metadata.get('course')).first() if str(metadata.get('course', '')).isdigit() else None
+        if course is None:
+            errors['course'] = ['Unknown course']
+        elif not (user.is_staff or course.instructor_id == user.id):
+            errors['course'] = ['Only the course instructor can add lectures']
+        if not metadata.get('title'):
+            errors['title'] = ['This field is required.']
+    return errors
+
+
+def parse_content_range(header):
+    """(start, end, total) from "bytes 0-1023/4096", or None"""
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == '*' else int(total)
+
+
+def start_upload(upload):
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    open(upload.temp_path, 'wb').close()
+
+
+def claim_upload(upload, status, **conditions):
+    """
+    Move the upload from 'uploading' to `status` ('receiving' or 'completing')
+    with a conditional UPDATE, so only one request at a time writes to or
+    completes it. Returns the claim's timestamp, which release_upload()
+    matches on, or None if another request holds the upload or `conditions`
+    (such as the expected offset) no longer hold.
+
+    A claim older than CHUNKED_UPLOAD_CLAIM_TIMEOUT is taken over, so a worker
+    that died mid-chunk or mid-completion doesn't block the upload forever. The
+    old holder's final update matches on its own timestamp and so fails, and a
+    taken-over completion checks that the assembled file is still there.
+    """
+    claimed_at = timezone.now()
+    stale = claimed_at - timedelta(seconds=settings.CHUNKED_UPLOAD_CLAIM_TIMEOUT)
+    claimed = ChunkedUpload.objects.filter(
+        Q(status='uploading') | Q(status__in=('receiving', 'completing'), updated_at__lt=stale),
+        pk=upload.pk, **conditions
+    ).update(status=status, updated_at=claimed_at)
+    return claimed_at if claimed else None
+
+
+def release_upload(upload, claimed_at, **changes):
+    """Hand a claimed upload back to 'uploading'; False if the claim was lost or the upload deleted"""
+    return bool(ChunkedUpload.objects.filter(pk=upload.pk, updated_at=claimed_at).exclude(status='complete').update(
+        status='uploading', updated_at=timezone.now(), **changes
+    ))
+
+
+def write_chunk(upload, stream, start, length, claimed_at):
+    """
+    Copy `length` bytes from the request stream into the partial file at
+    `start`, a block at a time, advance the upload's offset and release the
+    'receiving' claim. Returns the new offset, or None if the chunk was cut
+    short or the claim was lost.
+    """
+    written = 0
+    try:
+        with open(upload.temp_path, 'r+b') as destination:
+            # Anything past the offset is left over from an interrupted chunk
+            destination.seek(start)
+            destination.truncate()
+            while written < length:
+                block = stream.read(min(COPY_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                destination.write(block)
+                written += len(block)
+    finally:
+        if written != length:
+            # Client went away mid-chunk; the next attempt resumes from the old offset
+            release_upload(upload, claimed_at)
+    if written != length:
+        return None
+
+    new_offset = start + written
+    return new_offset if release_upload(upload, claimed_at, offset=new_offset) else None
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(COPY_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _build_document(upload, file):
+    return DocumentUpload(user=upload.user, document_type=upload.metadata['document_type'], document=file)
+
+
+def _build_lecture_video(upload, file):
+    return VideoLecture(
+        course_id=upload.metadata['course'],
+        title=upload.metadata['title'],
+        description=upload.metadata.get('description', ''),
+        video_file=file,
+    )
+
+
+BUILDERS = {
+    'document': _build_document,
+    'lecture_video': _build_lecture_video,
+}
+
+
+def _delete_stored_files(instance):
+    # A rolled back target still had its file moved into storage by FileField.pre_save
+    for field in instance._meta.concrete_fields if instance is not None else ():
+        stored = getattr(instance, field.name) if isinstance(field, FileField) else None
+        if stored:
+            stored.storage.delete(stored.name)
+
+
+def complete_upload(upload, claimed_at):
+    """
+    Save the assembled file through the target's FileField and mark the upload
+    complete, provided the 'completing' claim taken at `claimed_at` still holds.
+    Raises UploadTargetGone if a lecture's course has been deleted and
+    UploadClaimLost if another request took the upload over meanwhile.
+    """
+    if upload.target == 'lecture_video' and not Course.objects.filter(pk=upload.metadata['course']).exists():
+        raise UploadTargetGone
+    instance = None
+    try:
+        with open(upload.temp_path, 'rb') as assembled, transaction.atomic():
+            instance = BUILDERS[upload.target](upload, AssembledFile(assembled, name=upload.filename))
+            instance.save()
+            completed = ChunkedUpload.objects.filter(pk=upload.pk, status='completing', updated_at=claimed_at).update(
+                status='complete', result_id=instance.pk, updated_at=timezone.now()
+            )
+            if not completed:
+                raise UploadClaimLost
+    except IntegrityError:
+        # The target went away after the check
+        _delete_stored_files(instance)
+        raise UploadTargetGone
+    except UploadClaimLost:
+        _delete_stored_files(instance)
+        raise
+    upload.status, upload.result_id = 'complete', instance.pk
+    discard_upload(upload)
+    return instance
+
+
+def discard_upload(upload):
+    try:
+        os.remove(upload.temp_path)
+    except FileNotFoundError:
+        pass
@@ -10,6 +10,7 @@ from .views import (
     RegisterView,
     LoginView,
     PersonalInformationView,
+    FullProfileView,
     GlobalInformationView,
     SWOTAnalysisDetailView,
     SwotAnalysisViewSet,
@@ -55,11 +56,15 @@ from .views import (
     AccomplishmentShareViewSet,
     UserJobViewSet,
     ConversationViewSet,
-    MessageViewSet
+    MessageViewSet,
+    SearchView,
+    stream_lecture_video,
+    ChunkedUploadViewSet
 )
 
 router = DefaultRouter()
 router.register(r'documents', DocumentUploadViewSet, basename='documents')
+router.register(r'uploads', ChunkedUploadViewSet, basename='uploads')
 router.register(r'swot', SwotAnalysisViewSet, basename='swot')
 router.register(r'main-goals', MainGoalViewSet, basename='main-goal')
 router.register(r'sub-goals', SubGoalViewSet, basename='sub-goal')
@@ -109,8 +114,11 @@ urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
     path('personal-info/', PersonalInformationView.as_view(), name='personal-info'),
+    path('profile/', FullProfileView.as_view(), name='full-profile'),
     path('global-info/', GlobalInformationView.as_view(), name='global-info-list-create'),
     path('global-info/<int:pk>/', GlobalInformationDetailView.as_view(), name='global-info-detail'),
     path('settings/', UserSettingsView.as_view(), name='user-settings'),
     path('change-password/', change_password, name='change-password'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('media/lectures/<str:token>/', stream_lecture_video, name='lecture-stream'),
 ]
@@ -1,9 +1,19 @@
-from rest_framework import generics, status, viewsets
+from rest_framework import generics, mixins, status, viewsets
 from rest_framework.response import Response
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
 from django.core.exceptions import ValidationError
-from django.http import Http404
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from .serializers import (
     RegisterSerializer,
     LoginSerializer,
@@ -22,8 +32,10 @@ from .serializers import (
     WorkItemSerializer,
     SwotAnalysisSerializer,
     MainGoalSerializer,
+    GoalTreeSerializer,
     SubGoalSerializer,
     CourseSerializer,
+    CourseCatalogSerializer,
     QuizSerializer,
     VideoLectureSerializer,
     StrengthSerializer,
@@ -54,7 +66,8 @@ from .serializers import (
     AccomplishmentShareSerializer,
     UserJobSerializer,
     ConversationSerializer,
-    MessageSerializer
+    MessageSerializer,
+    ChunkedUploadSerializer
 )
 from .models import (
     CustomUser,
@@ -73,6 +86,7 @@ from .models import (
     WorkItem,
     SwotAnalysis,
     MainGoal,
+    subgoal_progress,
     SubGoal,
     Course,
     Quiz,
@@ -102,15 +116,52 @@ from .models import (
     MoodTracking,
     Accomplishment,
     AccomplishmentShare,
+    RecentPublicAccomplishment,
+    SearchDocument,
+    TagIndexEntry,
     UserJob,
     Conversation,
-    Message
+    ConversationReadState,
+    Message,
+    ChunkedUpload
+)
+from .pagination import CountlessCursorPagination, MessageCursorPagination, PublicFeedPagination
+from .realtime import publish_message, publish_read_receipt
+from .provisioning import get_provisioned, provision_user
+from .caching import get_accomplishment_stats, get_course_catalog, set_accomplishment_stats, set_course_catalog
+from . import search
+from .media import make_stream_token, read_stream_token, serve_file
+from .uploads import (
+    UploadClaimLost,
+    UploadTargetGone,
+    claim_upload,
+    complete_upload,
+    discard_upload,
+    file_checksum,
+    parse_content_range,
+    release_upload,
+    start_upload,
+    write_chunk,
 )
 from datetime import datetime, timedelta
+import hashlib
+import os
+from django.conf import settings
 from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.password_validation import validate_password
 
+def filter_by_tag_index(queryset, request, prefix=''):
+    """Apply ?tag= / ?skill= through TagIndexEntry (an indexed join, no JSON scanning)"""
+    for param in ('tag', 'skill'):
+        value = request.query_params.get(param)
+        if value:
+            queryset = queryset.filter(**{
+                f'{prefix}tag_entries__kind': param,
+                f'{prefix}tag_entries__value': TagIndexEntry.normalize(value),
+            })
+    return queryset
+
 # User Registration View
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
@@ -121,20 +172,12 @@ class RegisterView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         
         try:
-            # Create the user
-            user = serializer.save()
-            
-            # Create PersonalInformation
-            PersonalInformation.objects.create(
-                user=user,
-                email=user.email,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                preferred_full_name=f"{user.first_name} {user.last_name}".strip()
-            )
+            with transaction.atomic():
+                # Create the user
+                user = serializer.save()
 
-            # Create UserSettings
-            UserSettings.objects.create(user=user)
+                # Create the personal, global, professional and settings rows up front
+                provision_user(user)
 
             # Generate tokens
             refresh = RefreshToken.for_user(user)
@@ -187,16 +230,7 @@ class PersonalInformationView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        personal_info, created = PersonalInformation.objects.get_or_create(
-            user=self.request.user,
-            defaults={
-                'email': self.request.user.email,
-                'first_name': self.request.user.first_name,
-                'last_name': self.request.user.last_name,
-                'preferred_full_name': f"{self.request.user.first_name} {self.request.user.last_name}".strip()
-            }
-        )
-        return personal_info
+        return get_provisioned(PersonalInformation, self.request.user)
 
     def put(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -222,7 +256,101 @@ class PersonalInformationView(generics.RetrieveUpdateDestroyAPIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class WorkExperienceViewSet(viewsets.ModelViewSet):
+class FullProfileView(generics.GenericAPIView):
+    """
+    Personal, global and professional information (with every section) in one response.
+
+    The ETag is built from the updated_at of the underlying rows, fetched in a
+    single query, so a matching If-None-Match is answered with 304 before
+    anything is loaded or serialized.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_etag(self, user):
+        versions = CustomUser.objects.filter(pk=user.pk).annotate(
+            personal_updated=Subquery(PersonalInformation.objects.filter(user=OuterRef('pk')).values('updated_at')[:1]),
+            global_updated=Subquery(GlobalInformation.objects.filter(user=OuterRef('pk')).values('updated_at')[:1]),
+            professional_updated=Subquery(ProfessionalInformation.objects.filter(user=OuterRef('pk')).values('updated_at')[:1]),
+        ).values_list('personal_updated', 'global_updated', 'professional_updated').first()
+        raw = '|'.join([str(user.pk)] + [value.isoformat() if value else '-' for value in versions or ()])
+        return quote_etag(hashlib.sha1(raw.encode('utf-8')).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request.user)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            context = self.get_serializer_context()
+            personal_info = PersonalInformation.objects.filter(user=request.user).first()
+            global_info = GlobalInformation.objects.filter(user=request.user).first()
+            professional_info = ProfessionalInformation.objects.with_sections().filter(user=request.user).first()
+            response = Response({
+                'personal_info': PersonalInformationSerializer(personal_info, context=context).data if personal_info else None,
+                'global_info': GlobalInformationSerializer(global_info, context=context).data if global_info else None,
+                'professional_info': ProfessionalInformationSerializer(professional_info, context=context).data if professional_info else None,
+            })
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+class ProfileSectionBulkMixin:
+    """
+    /bulk/ endpoint for the profile section viewsets.
+
+    POST a list of items to create them, PATCH a list of items with their ids to
+    update them, DELETE {"ids": [...]} (or ?ids=1,2) to remove them. Each call is
+    one transaction: if any item is invalid nothing is written and the errors
+    come back as a list in request order.
+    """
+    bulk_max_items = 200
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'DELETE':
+            return self.bulk_destroy(request)
+
+        if not isinstance(request.data, list):
+            return Response({'error': 'Expected a list of items'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.method == 'PATCH':
+            ids = [item.get('id') for item in request.data if isinstance(item, dict)]
+            instances = self.get_queryset().in_bulk([pk for pk in ids if isinstance(pk, int) or str(pk).isdigit()])
+            serializer = self.get_serializer(instances, data=request.data, many=True, partial=True, max_length=self.bulk_max_items)
+            success_status = status.HTTP_200_OK
+        else:
+            serializer = self.get_serializer(data=request.data, many=True, max_length=self.bulk_max_items)
+            success_status = status.HTTP_201_CREATED
+
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        prof_info = get_provisioned(ProfessionalInformation, request.user)
+        with transaction.atomic():
+            serializer.save(professional_info=prof_info)
+            # bulk_create/bulk_update skip post_save, so bump the profile ETag here
+            ProfessionalInformation.objects.filter(pk=prof_info.pk).update(updated_at=timezone.now())
+        return Response(serializer.data, status=success_status)
+
+    def bulk_destroy(self, request):
+        raw_ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if raw_ids is None:
+            raw_ids = [pk for pk in request.query_params.get('ids', '').split(',') if pk]
+        try:
+            ids = {int(pk) for pk in raw_ids}
+        except (TypeError, ValueError):
+            return Response({'error': 'ids must be a list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids or len(ids) > self.bulk_max_items:
+            return Response({'error': f'Provide between 1 and {self.bulk_max_items} ids'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset().filter(pk__in=ids)
+        missing = ids - set(queryset.values_list('pk', flat=True))
+        if missing:
+            return Response({'errors': {'ids': sorted(missing)}, 'error': 'Not found'}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            queryset.delete()
+        return Response({'deleted': len(ids)}, status=status.HTTP_200_OK)
+
+class WorkExperienceViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = WorkExperienceSerializer
     permission_classes = [IsAuthenticated]
 
@@ -230,10 +358,10 @@ class WorkExperienceViewSet(viewsets.ModelViewSet):
         return WorkExperience.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
-class PreviousExperienceViewSet(viewsets.ModelViewSet):
+class PreviousExperienceViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = PreviousExperienceSerializer
     permission_classes = [IsAuthenticated]
 
@@ -241,10 +369,10 @@ class PreviousExperienceViewSet(viewsets.ModelViewSet):
         return PreviousExperience.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = EducationSerializer
     permission_classes = [IsAuthenticated]
 
@@ -252,10 +380,10 @@ class EducationViewSet(viewsets.ModelViewSet):
         return Education.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
-class LanguageSkillViewSet(viewsets.ModelViewSet):
+class LanguageSkillViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = LanguageSkillSerializer
     permission_classes = [IsAuthenticated]
 
@@ -263,10 +391,10 @@ class LanguageSkillViewSet(viewsets.ModelViewSet):
         return LanguageSkill.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
-class CertificateViewSet(viewsets.ModelViewSet):
+class CertificateViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = CertificateSerializer
     permission_classes = [IsAuthenticated]
 
@@ -274,10 +402,10 @@ class CertificateViewSet(viewsets.ModelViewSet):
         return Certificate.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
-class HonorsAwardsPublicationsViewSet(viewsets.ModelViewSet):
+class HonorsAwardsPublicationsViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = HonorsAwardsPublicationsSerializer
     permission_classes = [IsAuthenticated]
 
@@ -285,10 +413,10 @@ class HonorsAwardsPublicationsViewSet(viewsets.ModelViewSet):
         return HonorsAwardsPublications.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
-class FunctionalSkillViewSet(viewsets.ModelViewSet):
+class FunctionalSkillViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = FunctionalSkillSerializer
     permission_classes = [IsAuthenticated]
 
@@ -296,10 +424,10 @@ class FunctionalSkillViewSet(viewsets.ModelViewSet):
         return FunctionalSkill.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
-class TechnicalSkillViewSet(viewsets.ModelViewSet):
+class TechnicalSkillViewSet(ProfileSectionBulkMixin, viewsets.ModelViewSet):
     serializer_class = TechnicalSkillSerializer
     permission_classes = [IsAuthenticated]
 
@@ -307,7 +435,7 @@ class TechnicalSkillViewSet(viewsets.ModelViewSet):
         return TechnicalSkill.objects.filter(professional_info__user=self.request.user)
 
     def perform_create(self, serializer):
-        prof_info, _ = ProfessionalInformation.objects.get_or_create(user=self.request.user)
+        prof_info = get_provisioned(ProfessionalInformation, self.request.user)
         serializer.save(professional_info=prof_info)
 
 # Global Information Views
@@ -316,9 +444,7 @@ class GlobalInformationView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        # Get or create the GlobalInformation instance for the current user
-        obj, created = GlobalInformation.objects.get_or_create(user=self.request.user)
-        return obj
+        return get_provisioned(GlobalInformation, self.request.user)
 
     def post(self, request, *args, **kwargs):
         # Check if GlobalInformation already exists for this user
@@ -340,24 +466,7 @@ class GlobalInformationDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        try:
-            return GlobalInformation.objects.get(user=self.request.user)
-        except GlobalInformation.DoesNotExist:
-            return GlobalInformation.objects.create(
-                user=self.request.user,
-                nationality='',
-                current_location='',
-                languages='',
-                time_zone='',
-                availability='',
-                preferred_communication='',
-                social_media_links='',
-                hobbies_interests='',
-                volunteer_work='',
-                travel_experience='',
-                cultural_background='',
-                dietary_preferences=''
-            )
+        return get_provisioned(GlobalInformation, self.request.user)
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -379,14 +488,19 @@ class ProfessionalInformationViewSet(viewsets.ModelViewSet):
     serializer_class = ProfessionalInformationSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
+    # One row per user
+    pagination_class = None
 
     def get_queryset(self):
-        return ProfessionalInformation.objects.filter(user=self.request.user)
+        return ProfessionalInformation.objects.with_sections().filter(user=self.request.user)
 
-    def perform_create(self, serializer):
-        if ProfessionalInformation.objects.filter(user=self.request.user).exists():
-            raise ValidationError("Professional Information already exists for this user.")
-        serializer.save(user=self.request.user)
+    def create(self, request, *args, **kwargs):
+        # Every account already has its row (see provisioning.py), so creating fills in that row
+        instance = get_provisioned(ProfessionalInformation, request.user)
+        serializer = self.get_serializer(instance, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(self.get_serializer(self.get_object()).data, status=status.HTTP_200_OK)
 
     def get_object(self):
         queryset = self.get_queryset()
@@ -490,6 +604,126 @@ class DocumentUploadViewSet(viewsets.ModelViewSet):
         serializer.save(user=request.user)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+class ChunkedUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin,
+                           mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Resumable uploads for documents and lecture videos.
+
+    1. POST /uploads/ with target, filename, size and metadata (document_type for
+       documents; course, title and description for lecture videos).
+    2. PUT the raw bytes to /uploads/<id>/chunk/ with a Content-Range header, in
+       order, up to CHUNKED_UPLOAD_MAX_CHUNK_SIZE each. After a disconnect,
+       GET /uploads/<id>/ and continue from `offset`.
+    3. POST /uploads/<id>/complete/ to turn it into the DocumentUpload or VideoLecture.
+    """
+    serializer_class = ChunkedUploadSerializer
+    queryset = ChunkedUpload.objects.all()
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user).order_by('-created_at', '-id')
+
+    def perform_create(self, serializer):
+        upload = serializer.save(user=self.request.user)
+        start_upload(upload)
+
+    def perform_destroy(self, instance):
+        discard_upload(instance)
+        instance.delete()
+
+    def claim_conflict(self, upload):
+        """Why claim_upload() failed, from the row as it is now"""
+        current = ChunkedUpload.objects.filter(pk=upload.pk).values('status', 'offset').first()
+        if current is None:
+            raise Http404
+        if current['status'] == 'complete':
+            return Response({'error': 'Upload already completed'}, status=status.HTTP_409_CONFLICT)
+        if current['status'] != 'uploading':
+            return Response(
+                {'error': 'Another request is writing to this upload', 'offset': current['offset']},
+                status=status.HTTP_409_CONFLICT
+            )
+        # Out of order or a replay after a lost response: tell the client where to resume
+        return Response({'error': 'Unexpected offset', 'offset': current['offset']}, status=status.HTTP_409_CONFLICT)
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        upload = self.get_object()
+        if upload.status == 'complete':
+            return Response({'error': 'Upload already completed'}, status=status.HTTP_409_CONFLICT)
+
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length <= 0:
+            return Response({'error': 'Content-Length is required'}, status=status.HTTP_411_LENGTH_REQUIRED)
+        if length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+            return Response(
+                {'error': f'Chunks are limited to {settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE} bytes'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        content_range = parse_content_range(request.headers.get('Content-Range'))
+        start = content_range[0] if content_range else upload.offset
+        if content_range and (content_range[1] - start + 1 != length or content_range[2] not in (None, upload.size)):
+            return Response({'error': 'Content-Range does not match the chunk'}, status=status.HTTP_400_BAD_REQUEST)
+        if start + length > upload.size:
+            return Response({'error': 'Chunk goes past the declared size'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only one request writes at a time, and only at the stored offset
+        claimed_at = claim_upload(upload, 'receiving', offset=start)
+        if claimed_at is None:
+            return self.claim_conflict(upload)
+        # Read straight from the request stream; request.data would buffer the body
+        offset = write_chunk(upload, request, start, length, claimed_at)
+        if offset is None:
+            current = ChunkedUpload.objects.filter(pk=upload.pk).values_list('offset', flat=True).first()
+            return Response({'error': 'Chunk was not stored', 'offset': current}, status=status.HTTP_409_CONFLICT)
+        return Response({'id': upload.id, 'offset': offset, 'size': upload.size})
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        upload = self.get_object()
+        if upload.status == 'complete':
+            return Response({'error': 'Upload already completed'}, status=status.HTTP_409_CONFLICT)
+        if upload.offset != upload.size:
+            return Response({'error': 'Upload is incomplete', 'offset': upload.offset}, status=status.HTTP_409_CONFLICT)
+        claimed_at = claim_upload(upload, 'completing', offset=upload.size)
+        if claimed_at is None:
+            return self.claim_conflict(upload)
+
+        try:
+            if not os.path.isfile(upload.temp_path):
+                # Taken over from a completion that died after moving the file away
+                start_upload(upload)
+                release_upload(upload, claimed_at, offset=0)
+                return Response({'error': 'Upload has to be sent again', 'offset': 0}, status=status.HTTP_409_CONFLICT)
+            if upload.checksum and file_checksum(upload.temp_path) != upload.checksum:
+                # Start over: the bytes on disk don't match what the client sent
+                start_upload(upload)
+                release_upload(upload, claimed_at, offset=0)
+                return Response({'error': 'Checksum mismatch', 'offset': 0}, status=status.HTTP_400_BAD_REQUEST)
+            instance = complete_upload(upload, claimed_at)
+        except (UploadClaimLost, FileNotFoundError):
+            # Another request took the upload over while this one was completing it
+            return self.claim_conflict(upload)
+        except UploadTargetGone:
+            # Nothing can be built from it any more
+            discard_upload(upload)
+            ChunkedUpload.objects.filter(pk=upload.pk).delete()
+            return Response(
+                {'error': 'The course for this upload no longer exists'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception:
+            release_upload(upload, claimed_at)
+            raise
+        result_serializer = DocumentUploadSerializer if upload.target == 'document' else VideoLectureSerializer
+        return Response({
+            **self.get_serializer(upload).data,
+            'result': result_serializer(instance, context=self.get_serializer_context()).data,
+        }, status=status.HTTP_201_CREATED)
+
 class WorkItemViewSet(viewsets.ModelViewSet):
     serializer_class = WorkItemSerializer
     permission_classes = [IsAuthenticated]
@@ -509,11 +743,31 @@ class SwotAnalysisViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Only return SWOT analyses for the logged-in user
-        return self.queryset.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user).with_quadrants()
 
     def perform_create(self, serializer):
         # Set the user to the logged-in user
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """The user's current (latest) analysis with all four quadrants, in two queries"""
+        analysis = SwotAnalysis.objects.filter(user=request.user).order_by('-pk').values('id', 'user').first()
+        if analysis is None:
+            return Response({'error': 'No SWOT analysis found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # One UNION ALL over the four quadrant tables
+        quadrants = SwotAnalysis.quadrant_models()
+        parts = [
+            model.objects.filter(swot_analysis_id=analysis['id'])
+            .annotate(quadrant=Value(related_name))
+            .values_list('quadrant', 'id', 'description')
+            for related_name, (model, _) in quadrants.items()
+        ]
+        board = {**analysis, **{related_name: [] for related_name in quadrants}}
+        for quadrant, pk, description in parts[0].union(*parts[1:], all=True).order_by('id'):
+            board[quadrant].append({'id': pk, 'description': description})
+        return Response(board)
 # Retrieve, Update, Delete SWOTAnalysis
 class SWOTAnalysisDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = SwotAnalysis.objects.all()
@@ -521,7 +775,7 @@ class SWOTAnalysisDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
     def get_queryset(self):
         # Retrieve SWOT analysis for the specific logged-in user only
-        return SwotAnalysis.objects.filter(user=self.request.user)
+        return SwotAnalysis.objects.filter(user=self.request.user).with_quadrants()
     def perform_create(self, serializer):
         # Automatically associate the SWOT entry with the logged-in user
         serializer.save(user=self.request.user)
@@ -538,17 +792,104 @@ class SWOTAnalysisDetailView(generics.RetrieveUpdateDestroyAPIView):
 class MainGoalViewSet(viewsets.ModelViewSet):
     queryset = MainGoal.objects.all()
     serializer_class = MainGoalSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = self.queryset.filter(user=self.request.user).order_by('start_date', 'pk')
+        if self.action != 'tree':
+            # tree prefetches annotated subgoals itself
+            queryset = queryset.prefetch_related('subgoals')
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        Main goals with nested subgoals and completion percentages, in two queries.
+
+        Subgoal progress is spent over required effort, goal progress is weighted by
+        required effort, and the overall figure is weighted by goal weightage.
+        Pass ?rollup=cached to read each goal's stored progress instead of aggregating.
+        """
+        live = request.query_params.get('rollup') != 'cached'
+        queryset = self.filter_queryset(self.get_queryset())
+        if live:
+            queryset = queryset.with_progress()
+        goals = list(queryset.prefetch_related(Prefetch(
+            'subgoals', queryset=SubGoal.objects.annotate(progress=subgoal_progress()).order_by('start_date', 'pk')
+        )))
+        if live:
+            for goal in goals:
+                goal.progress = goal.live_progress
+
+        total_weight = sum(goal.weightage for goal in goals)
+        overall = sum(goal.progress * goal.weightage for goal in goals) / total_weight if total_weight else 0
+        return Response({
+            'overall_progress': overall,
+            'goals': GoalTreeSerializer(goals, many=True, context=self.get_serializer_context()).data,
+        })
 
 # SubGoal ViewSet
 class SubGoalViewSet(viewsets.ModelViewSet):
     queryset = SubGoal.objects.all()
     serializer_class = SubGoalSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Grouped by goal, then by start date: an IN over the owner's goals walks
+        # subgoal_goal_start_idx in order, where a join would sort in a temp b-tree
+        owned_goals = MainGoal.objects.filter(user=self.request.user).values('pk')
+        return self.queryset.filter(main_goal__in=owned_goals).order_by('main_goal', 'start_date', 'pk')
 
 class CourseViewSet(viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        queryset = self.queryset.with_purchase_status(self.request.user)
+        if self.action == 'list':
+            return queryset
+        return queryset.with_lectures()
+
+    def get_serializer_class(self):
+        # The catalog list leaves out lectures and quizzes; fetch a course for those
+        if self.action == 'list':
+            return CourseCatalogSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        # The catalog is the same for every user apart from is_purchased, so one
+        # copy per page is cached and each user's purchases are merged in here
+        url = request.build_absolute_uri()
+        catalog = get_course_catalog(url)
+        if catalog is None:
+            catalog = self.build_catalog()
+            set_course_catalog(url, catalog)
+
+        courses = catalog['results'] if isinstance(catalog, dict) else catalog
+        # The same EXISTS annotation as the other actions, for this page's courses only
+        purchased = dict(
+            Course.objects.filter(pk__in=[course['id'] for course in courses])
+            .with_purchase_status(request.user)
+            .values_list('pk', 'is_purchased')
+        )
+        courses = [{**course, 'is_purchased': purchased.get(course['id'], False)} for course in courses]
+        if isinstance(catalog, dict):
+            return Response({**catalog, 'results': courses})
+        return Response(courses)
+
+    def build_catalog(self):
+        queryset = self.filter_queryset(Course.objects.all())
+        page = self.paginate_queryset(queryset)
+        # No request in the context: nothing user specific ends up in the cache
+        serializer = CourseCatalogSerializer(page if page is not None else queryset, many=True, context={})
+        if page is not None:
+            return dict(self.get_paginated_response(serializer.data).data)
+        return serializer.data
+
     @action(detail=True, methods=['post'])
     def purchase(self, request, pk=None):
         course = self.get_object()
@@ -572,8 +913,37 @@ class CourseViewSet(viewsets.ModelViewSet):
         return context
 
 class VideoLectureViewSet(viewsets.ModelViewSet):
-    queryset = VideoLecture.objects.all()
+    queryset = VideoLecture.objects.prefetch_related('quizzes')
     serializer_class = VideoLectureSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_permissions(self):
+        # Anyone signed in can browse lectures; only staff add, change or remove them
+        if self.request.method not in SAFE_METHODS:
+            return [IsAdminUser()]
+        return super().get_permissions()
+
+    @action(detail=True, methods=['get'], url_path='stream-url', permission_classes=[IsAuthenticated])
+    def stream_url(self, request, pk=None):
+        """
+        Check access to the lecture once and return a signed URL for the player.
+
+        The URL supports byte ranges and stays valid for MEDIA_STREAM_TOKEN_MAX_AGE
+        seconds, so seeking and chunked playback don't repeat the purchase check.
+        """
+        lecture = get_object_or_404(VideoLecture.objects.select_related('course'), pk=pk)
+        course = lecture.course
+        user = request.user
+        if not (user.is_staff or course.instructor_id == user.id or course.purchasers.filter(id=user.id).exists()):
+            return Response({'detail': 'Purchase this course to watch its lectures.'}, status=status.HTTP_403_FORBIDDEN)
+        if not lecture.video_file:
+            return Response({'detail': 'This lecture has no video.'}, status=status.HTTP_404_NOT_FOUND)
+
+        token = make_stream_token(lecture, user)
+        return Response({
+            'url': request.build_absolute_uri(reverse('lecture-stream', args=[token])),
+            'expires_in': settings.MEDIA_STREAM_TOKEN_MAX_AGE,
+        })
 
 class QuizViewSet(viewsets.ModelViewSet):
     queryset = Quiz.objects.all()
@@ -636,7 +1006,7 @@ class HabitViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Habit.objects.filter(user=self.request.user)
+        return Habit.objects.filter(user=self.request.user).order_by('-created_at')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -676,9 +1046,22 @@ class UserSettingsView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        # Get or create settings for the current user
-        settings, created = UserSettings.objects.get_or_create(user=self.request.user)
-        return settings
+        return get_provisioned(UserSettings, self.request.user)
+
+@require_http_methods(['GET', 'HEAD'])
+def stream_lecture_video(request, token):
+    """Serve a lecture video for a signed stream-url token; no database access per request"""
+    payload = read_stream_token(token)
+    if payload is None:
+        raise Http404
+    try:
+        path = default_storage.path(payload['f'])
+    except NotImplementedError:
+        # Remote storage (S3 etc.) handles ranges itself
+        return HttpResponseRedirect(default_storage.url(payload['f']))
+    if not os.path.isfile(path):
+        raise Http404
+    return serve_file(request, path, payload['f'])
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -735,6 +1118,9 @@ class SurveyResponseViewSet(viewsets.ModelViewSet):
     serializer_class = SurveyResponseSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user).order_by('-submitted_at', '-pk')
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -749,6 +1135,9 @@ class UserRewardViewSet(viewsets.ModelViewSet):
     serializer_class = UserRewardSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user).order_by('-earned_at', '-pk')
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -757,9 +1146,10 @@ class TimeEntryViewSet(viewsets.ModelViewSet):
     queryset = TimeEntry.objects.all()
     serializer_class = TimeEntrySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CountlessCursorPagination
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user).order_by('-start_time')
 
 # Note ViewSet
 class NoteViewSet(viewsets.ModelViewSet):
@@ -768,13 +1158,16 @@ class NoteViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        queryset = self.queryset.filter(user=self.request.user).order_by('-is_pinned', '-updated_at')
+        return filter_by_tag_index(queryset, self.request)
 
 # Credit Score ViewSet
 class CreditScoreViewSet(viewsets.ModelViewSet):
     queryset = CreditScore.objects.all()
     serializer_class = CreditScoreSerializer
     permission_classes = [IsAuthenticated]
+    # One row per user
+    pagination_class = None
 
     def get_queryset(self):
         return self.queryset.filter(user=self.request.user)
@@ -790,6 +1183,9 @@ class UserAssessmentViewSet(viewsets.ModelViewSet):
     serializer_class = UserAssessmentSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user).order_by('-completed_at', '-pk')
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -826,7 +1222,7 @@ class ActivityViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user).order_by('-date', '-created_at')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)  # Automatically set the user
@@ -901,10 +1297,11 @@ class CoachViewSet(viewsets.ModelViewSet):
 class MoodTrackingViewSet(viewsets.ModelViewSet):
     serializer_class = MoodTrackingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CountlessCursorPagination
 
     def get_queryset(self):
         # Only return mood entries for the current authenticated user
-        return MoodTracking.objects.filter(user=self.request.user)
+        return MoodTracking.objects.filter(user=self.request.user).order_by('-date', '-created_at')
 
     def perform_create(self, serializer):
         # Save mood entry with the current user
@@ -923,17 +1320,31 @@ class MoodTrackingViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def history(self, request):
-        """Get mood history for the current user"""
-        moods = MoodTracking.objects.filter(user=request.user).order_by('-date')
-        serializer = self.get_serializer(moods, many=True)
-        return Response(serializer.data)
+        """Get mood history for the current user, newest first"""
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 class AccomplishmentViewSet(viewsets.ModelViewSet):
     serializer_class = AccomplishmentSerializer
     permission_classes = [IsAuthenticated]
 
+    def with_list_data(self, queryset):
+        # Everything AccomplishmentSerializer needs, so listing costs one query.
+        # A correlated count rather than a join keeps the row order index-driven.
+        shares = AccomplishmentShare.objects.filter(
+            accomplishment=OuterRef('pk')
+        ).order_by().values('accomplishment').annotate(count=Count('id')).values('count')
+        return queryset.select_related('user').annotate(shares_count=Coalesce(Subquery(shares), 0))
+
+    def filter_feed(self, queryset, request, prefix=''):
+        category = request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category=category)
+        return filter_by_tag_index(queryset, request, prefix)
+
     def get_queryset(self):
-        return Accomplishment.objects.filter(user=self.request.user)
+        return self.with_list_data(filter_by_tag_index(Accomplishment.objects.filter(user=self.request.user), self.request))
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -967,10 +1378,20 @@ class AccomplishmentViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def public(self, request):
-        """Get public accomplishments"""
-        accomplishments = Accomplishment.objects.filter(is_public=True)
+        """Public accomplishment feed, newest first, filterable by category, tag and skill"""
+        paginator = PublicFeedPagination()
+        if settings.PUBLIC_FEED_WINDOW:
+            # Page over the bounded recent-public table, then load just that page
+            entries = self.filter_feed(RecentPublicAccomplishment.objects.all(), request, prefix='accomplishment__')
+            ids = [entry.pk for entry in paginator.paginate_queryset(entries, request, view=self)]
+            by_id = self.with_list_data(Accomplishment.objects.filter(pk__in=ids)).in_bulk()
+            accomplishments = [by_id[pk] for pk in ids if pk in by_id]
+        else:
+            # Served from the partial index on public rows
+            queryset = self.filter_feed(self.with_list_data(Accomplishment.objects.filter(is_public=True)), request)
+            accomplishments = paginator.paginate_queryset(queryset, request, view=self)
         serializer = self.get_serializer(accomplishments, many=True)
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def by_category(self, request):
@@ -981,26 +1402,35 @@ class AccomplishmentViewSet(viewsets.ModelViewSet):
         else:
             accomplishments = self.get_queryset()
 
-        serializer = self.get_serializer(accomplishments, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(accomplishments)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get accomplishment statistics"""
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total': queryset.count(),
-            'by_category': {},
-            'public_count': queryset.filter(is_public=True).count(),
-            'recent': queryset.filter(
-                date__gte=timezone.now().date() - timedelta(days=30)
-            ).count()
-        }
-
-        # Count by category
-        for category, _ in Accomplishment.CATEGORY_CHOICES:
-            stats['by_category'][category] = queryset.filter(category=category).count()
+        stats = get_accomplishment_stats(request.user.id)
+        if stats is None:
+            # Everything in one conditional-aggregation query
+            aggregates = {
+                'total': Count('id'),
+                'public_count': Count('id', filter=Q(is_public=True)),
+                'recent': Count('id', filter=Q(date__gte=timezone.now().date() - timedelta(days=30))),
+            }
+            for category, _ in Accomplishment.CATEGORY_CHOICES:
+                aggregates[f'category_{category}'] = Count('id', filter=Q(category=category))
+            counts = Accomplishment.objects.filter(user=request.user).aggregate(**aggregates)
+
+            stats = {
+                'total': counts['total'],
+                'by_category': {
+                    category: counts[f'category_{category}']
+                    for category, _ in Accomplishment.CATEGORY_CHOICES
+                },
+                'public_count': counts['public_count'],
+                'recent': counts['recent'],
+            }
+            set_accomplishment_stats(request.user.id, stats)
 
         return Response(stats)
 
@@ -1009,7 +1439,38 @@ class AccomplishmentShareViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return AccomplishmentShare.objects.filter(accomplishment__user=self.request.user)
+        return AccomplishmentShare.objects.filter(user=self.request.user)
+
+class SearchView(generics.GenericAPIView):
+    """
+    Full-text search over the current user's notes, work items, accomplishments and jobs.
+
+    ?q= the search text, ?type= optional comma separated document types, ?limit= max results.
+    """
+    permission_classes = [IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        valid_types = dict(SearchDocument.DOC_TYPES)
+        doc_types = [t for t in request.query_params.get('type', '').split(',') if t]
+        invalid = [t for t in doc_types if t not in valid_types]
+        if invalid:
+            return Response(
+                {'error': f"Unknown type(s): {', '.join(invalid)}", 'types': list(valid_types)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            limit = 20
+
+        results = search.search(request.user, query, doc_types, limit)
+        return Response({'query': query, 'count': len(results), 'results': results})
 
 class UserJobViewSet(viewsets.ModelViewSet):
     serializer_class = UserJobSerializer
@@ -1026,27 +1487,52 @@ class ConversationViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Conversation.objects.filter(participants=self.request.user)
+        # Driven by the user's read states, which are kept in inbox order by readstate_user_activity_idx
+        return (
+            Conversation.objects.filter(read_states__user=self.request.user)
+            .select_related('last_message__sender')
+            .prefetch_related('participants')
+            .annotate(unread_count=F('read_states__unread_count'))
+            .order_by('-read_states__last_activity_at', '-read_states__conversation')
+        )
 
     @action(detail=True, methods=['get'])
     def messages(self, request, pk=None):
         conversation = self.get_object()
-        messages = conversation.messages.order_by('created_at')
-        serializer = MessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        messages = conversation.messages.select_related('sender')
+        paginator = MessageCursorPagination()
+        page = paginator.paginate_queryset(messages, request, view=self)
+        serializer = MessageSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
         conversation = self.get_object()
-        conversation.messages.filter(is_read=False).exclude(sender=request.user).update(is_read=True)
+        read_at = conversation.mark_read(request.user)
+        transaction.on_commit(lambda: publish_read_receipt(conversation, request.user, read_at))
         return Response({'status': 'marked as read'})
 
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MessageCursorPagination
 
     def get_queryset(self):
-        return Message.objects.filter(conversation__participants=self.request.user)
+        queryset = Message.objects.filter(conversation__participants=self.request.user).select_related('sender')
+        conversation_id = self.request.query_params.get('conversation')
+        if conversation_id:
+            try:
+                conversation_id = int(conversation_id)
+            except ValueError:
+                raise ParseError('conversation must be a conversation id')
+            queryset = queryset.filter(conversation_id=conversation_id)
+        return queryset
 
     def perform_create(self, serializer):
-        serializer.save(sender=self.request.user)
\ No newline at end of file
+        with transaction.atomic():
+            message = serializer.save(sender=self.request.user)
+            message.conversation.record_message(message)
+            transaction.on_commit(lambda: publish_message(message))
+
+    def perform_destroy(self, instance):
+        instance.conversation.delete_message(instance)
\ No newline at end of file
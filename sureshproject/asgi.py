@@ -1,5 +1,8 @@
 """
 ASGI config for sureshproject project.
+
+HTTP requests go to Django; WebSocket connections are handled by
+suresh.realtime (live conversation updates).
 """
 
 import os
@@ -8,4 +11,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sureshproject.settings')
 
-application = get_asgi_application() 
\ No newline at end of file
+django_application = get_asgi_application()
+
+from suresh.realtime import websocket_application  # noqa: E402  (needs apps loaded)
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        await websocket_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
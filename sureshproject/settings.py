@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 from pathlib import Path
 import os
 
+import dj_database_url
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure--9vyg166!n-7b#yk)lp9h91=q=#^rq!jq03hjkm6e#gd0gvt2*')
@@ -52,6 +54,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'suresh.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'sureshproject.urls'
@@ -73,20 +76,85 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'sureshproject.wsgi.application'
+ASGI_APPLICATION = 'sureshproject.asgi.application'
+
+# Pub/sub used to push conversation updates to WebSocket clients.
+# The in-memory backend only reaches sockets held by the same process.
+REALTIME_BROADCAST_BACKEND = os.environ.get('REALTIME_BROADCAST_BACKEND', 'suresh.realtime.InMemoryBroadcast')
 
 # Database configuration
+# DATABASE_URL selects the primary (defaults to the bundled sqlite file).
+# DATABASE_REPLICA_URL optionally adds a read replica used for list/retrieve.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
 DATABASES = {
+    'default': dj_database_url.config(
+        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        conn_max_age=DB_CONN_MAX_AGE,
+    ),
+}
+
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = dj_database_url.parse(
+        os.environ['DATABASE_REPLICA_URL'],
+        conn_max_age=DB_CONN_MAX_AGE,
+    )
+    # Tests run against a single database
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+for database in DATABASES.values():
+    database['CONN_HEALTH_CHECKS'] = DB_CONN_MAX_AGE > 0
+
+DATABASE_ROUTERS = ['suresh.db_routers.PrimaryReplicaRouter']
+
+# Applied to every new sqlite connection. WAL lets readers proceed while a
+# worker writes; busy_timeout (ms) makes writers wait instead of failing with
+# "database is locked". Set SQLITE_TUNING=off to keep sqlite's defaults.
+SQLITE_PRAGMAS = {} if os.environ.get('SQLITE_TUNING', 'on') == 'off' else {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024))),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', '-20000')),  # negative = KiB
+}
+
+# Number of newest public accomplishments kept in the RecentPublicAccomplishment
+# table. When set, the public feed only reads that bounded table; 0 serves the
+# feed straight from the accomplishment table's partial index.
+PUBLIC_FEED_WINDOW = int(os.environ.get('PUBLIC_FEED_WINDOW', '0'))
+
+# Local memory by default (per process). Point CACHE_BACKEND/CACHE_LOCATION at a
+# shared backend such as django.core.cache.backends.redis.RedisCache in production.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
+# Signals invalidate the course catalog and accomplishment stats only in the
+# cache of the process that made the change. With a per-process backend (the
+# LocMem default) every other worker keeps its copy until it expires, so the
+# timeouts stay short unless the cache is shared between processes.
+COURSE_CATALOG_CACHE_TIMEOUT = int(os.environ.get(
+    'COURSE_CATALOG_CACHE_TIMEOUT',
+    '30' if CACHES['default']['BACKEND'].endswith('.LocMemCache') else '3600',
+))
+ACCOMPLISHMENT_STATS_CACHE_TIMEOUT = int(os.environ.get(
+    'ACCOMPLISHMENT_STATS_CACHE_TIMEOUT',
+    '30' if CACHES['default']['BACKEND'].endswith('.LocMemCache') else str(60 * 60 * 24),
+))
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # Every list endpoint is paginated unless its viewset sets pagination_class = None.
+    # Large append-only tables use suresh.pagination.CountlessCursorPagination instead.
+    'DEFAULT_PAGINATION_CLASS': 'suresh.pagination.StandardPagination',
+    # Default page size for paginated list endpoints; clients may ask for up to API_MAX_PAGE_SIZE
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', '50')),
 }
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '200'))
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -148,10 +216,44 @@ STATICFILES_DIRS = [
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Uploads under these MEDIA_ROOT prefixes are only served through signed stream
+# URLs. The development media view refuses them; a front-end server publishing
+# MEDIA_ROOT under MEDIA_URL must exclude them as well.
+PROTECTED_MEDIA_PREFIXES = ('course_videos/',)
+
+# Lecture video streaming (see suresh/media.py). A stream-url token is valid this long.
+MEDIA_STREAM_TOKEN_MAX_AGE = int(os.environ.get('MEDIA_STREAM_TOKEN_MAX_AGE', str(6 * 60 * 60)))
+# '' streams from Django (sendfile via the WSGI file_wrapper where available);
+# 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache/lighttpd) hand the file to the front-end server.
+MEDIA_STREAM_OFFLOAD = os.environ.get('MEDIA_STREAM_OFFLOAD', '')
+# nginx "internal" location aliased to MEDIA_ROOT, used with x-accel-redirect
+MEDIA_STREAM_ACCEL_PREFIX = os.environ.get('MEDIA_STREAM_ACCEL_PREFIX', '/protected-media/')
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  
 
+# Resumable chunked uploads (see suresh/uploads.py). Partial files live outside MEDIA_ROOT
+# so they are never served; keep it on the same filesystem so completion is a rename.
+CHUNKED_UPLOAD_DIR = os.environ.get('CHUNKED_UPLOAD_DIR', os.path.join(BASE_DIR, 'chunked_uploads'))
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = int(os.environ.get('CHUNKED_UPLOAD_MAX_CHUNK_SIZE', str(8 * 1024 * 1024)))
+CHUNKED_UPLOAD_MAX_SIZE = int(os.environ.get('CHUNKED_UPLOAD_MAX_SIZE', str(5 * 1024 * 1024 * 1024)))
+# Seconds after which a chunk write that never finished (e.g. a killed worker) stops blocking the upload
+CHUNKED_UPLOAD_CLAIM_TIMEOUT = int(os.environ.get('CHUNKED_UPLOAD_CLAIM_TIMEOUT', '600'))
+
+# Full-text search on sqlite ranks (bm25) only the newest this many matches of a
+# query, which keeps broad queries fast on large indexes; 0 ranks every match.
+# `manage.py bench_search` measures the effect.
+SEARCH_RANK_WINDOW = int(os.environ.get('SEARCH_RANK_WINDOW', '2000'))
+
+# Profile picture / reward image thumbnails (see suresh/thumbnails.py), bounding box in pixels per size.
+THUMBNAIL_SIZES = {'small': 64, 'medium': 256, 'large': 512}
+THUMBNAIL_FORMATS = ('webp', 'jpeg')
+THUMBNAIL_QUALITY = int(os.environ.get('THUMBNAIL_QUALITY', '82'))
+# Background threads per process; 0 generates thumbnails inline once the saving transaction commits.
+# Queued jobs live in memory and are lost when a worker restarts; run
+# `manage.py generate_thumbnails` (e.g. from cron or after a deploy) to catch up.
+THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', '2'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,